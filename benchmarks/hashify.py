@@ -0,0 +1,48 @@
+"""Microbenchmark of hashing Python objects.
+
+Compares the original pickle based `hashify` with the canonical encoding, which gives the same hash for equal
+dictionaries and sets regardless of their order, shared objects or hash randomization.
+
+Usage: python benchmarks/hashify.py
+"""
+
+import hashlib
+import pickle  # noqa: S403
+import timeit
+from decimal import Decimal
+from typing import Any
+
+from orval import hashify
+
+SMALL_DICT = {"user_id": 1, "name": "Marty McFly", "score": 1.21, "active": True, "tags": None}
+RECORDS = [{"id": i, "name": f"user {i}", "score": i / 3, "active": i % 2 == 0} for i in range(10_000)]
+MIXED_RECORDS = [{**record, "price": Decimal(i)} for i, record in enumerate(RECORDS)]
+NESTED = {"users": RECORDS[:100], "meta": {"page": 1, "tags": ["great", "scott"]}}
+INTS = tuple(range(1000))
+STRINGS = [f"great scott {i}" for i in range(1000)]
+BIG_STRING = "x" * 10_000_000
+
+
+def pickle_hashify(obj: Any) -> str:
+    """Hash an object with the original pickle based implementation."""
+    return hashlib.sha256(pickle.dumps(obj, protocol=3)).hexdigest()
+
+
+def bench(label: str, obj: Any, number: int) -> None:
+    """Time both implementations on the same object, best of five, and print the ratio."""
+    before = min(timeit.repeat(lambda: pickle_hashify(obj), number=number, repeat=5)) / number
+    after = min(timeit.repeat(lambda: hashify(obj), number=number, repeat=5)) / number
+    print(
+        f"{label:<16} pickle: {before * 1e6:10.1f} us/call  canonical: {after * 1e6:10.1f} us/call  "
+        f"ratio: {after / before:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench("small dict", SMALL_DICT, number=20_000)
+    bench("10k records", RECORDS, number=20)
+    bench("10k mixed", MIXED_RECORDS, number=5)
+    bench("nested payload", NESTED, number=500)
+    bench("1k ints", INTS, number=2_000)
+    bench("1k strings", STRINGS, number=2_000)
+    bench("10 MB string", [BIG_STRING], number=20)
@@ -0,0 +1,54 @@
+"""Microbenchmark of the string normalization behind the casing functions.
+
+Compares the original regular expression pipeline with the single-pass, translate based normalizer. The cache in
+front of the normalizer is bypassed, every call runs the full pipeline.
+
+Usage: python benchmarks/normalize.py
+"""
+
+import re
+import timeit
+import unicodedata
+from collections.abc import Callable
+from functools import partial
+
+from orval.strings import _normalize_text
+
+SHORT_KEYS = ["user_id", "Content-Type", "createdAt", "  Great   Scott!! ", "x-request-id", "Gréat Scött"]
+LONG_TEXT = "Great Scott! The flux-capacitor_is (finally) working... 1.21 gigawatts? Gréat Scött 🤘\n" * 64
+
+
+def regex_normalize(string: str, unicode: bool = True, compact_spaces: bool = True) -> str:
+    """Normalize a string with the original regular expression pipeline."""
+    if unicode:
+        value = unicodedata.normalize("NFKC", string)
+        text = re.sub(r"[^\w\s]|_", " ", value, flags=re.UNICODE)
+    else:
+        value = unicodedata.normalize("NFKD", string).encode("ascii", "ignore").decode("ascii")
+        text = re.sub(r"[^\w\s]|_", " ", value)
+    return re.sub(r"\s+", " ", text).strip() if compact_spaces else text.strip()
+
+
+def run(normalize: Callable[[str, bool, bool], str], strings: list[str], unicode: bool) -> None:
+    """Normalize every string once."""
+    for string in strings:
+        normalize(string, unicode, True)  # noqa: FBT003
+
+
+def bench(label: str, strings: list[str], number: int) -> None:
+    """Time both normalizers on the same strings and print the speedup."""
+    for unicode in (True, False):
+        for string in strings:
+            assert regex_normalize(string, unicode) == _normalize_text(string, unicode, compact_spaces=True)
+        before = timeit.timeit(partial(run, regex_normalize, strings, unicode), number=number)
+        after = timeit.timeit(partial(run, _normalize_text, strings, unicode), number=number)
+        calls = number * len(strings)
+        print(
+            f"{label:<12} unicode={unicode!s:<5} regex: {before / calls * 1e6:8.2f} us/call  "
+            f"translate: {after / calls * 1e6:8.2f} us/call  speedup: {before / after:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench("short keys", SHORT_KEYS, number=20_000)
+    bench(f"{len(LONG_TEXT) // 1024} KB text", [LONG_TEXT], number=2_000)
@@ -3,27 +3,113 @@
 from importlib import metadata
 
 from orval.byte_utils import pretty_bytes
-from orval.containers import chunkify, deep_merge, flatten
+from orval.containers import (
+    CompiledPath,
+    DeepChainMap,
+    achunkify,
+    aflatten,
+    chunked_map,
+    chunkify,
+    chunkify_buffer,
+    chunkify_by_size,
+    chunkify_file,
+    compile_path,
+    deep_merge,
+    flatten,
+    flatten_dict,
+    ichunkify,
+    unflatten_dict,
+    unique,
+)
 from orval.datetimes import utcnow
-from orval.hashing import hashify
-from orval.strings import camel_case, dot_case, kebab_case, pascal_case, slugify, snake_case, train_case, truncate
-from orval.utils import timing
+from orval.hashing import (
+    hashify,
+    hashify_cache_clear,
+    hashify_cache_info,
+    hashify_cache_invalidate,
+    hashify_file,
+    hashify_files,
+    hashify_many,
+    set_hashify_cache_size,
+)
+from orval.strings import (
+    Casings,
+    SlugRegistry,
+    camel_case,
+    camel_case_many,
+    convert_all,
+    dot_case,
+    dot_case_many,
+    kebab_case,
+    kebab_case_many,
+    normalize_cache_clear,
+    normalize_cache_info,
+    pascal_case,
+    pascal_case_many,
+    set_normalize_cache_size,
+    slugify,
+    slugify_many,
+    snake_case,
+    snake_case_many,
+    train_case,
+    train_case_many,
+    transform_keys,
+    truncate,
+    truncate_bytes,
+)
+from orval.utils import CacheInfo, timing
 
 __version__ = metadata.version(__package__)  # type: ignore[invalid-argument-type]
 __all__ = [
+    "CacheInfo",
+    "Casings",
+    "CompiledPath",
+    "DeepChainMap",
+    "SlugRegistry",
+    "achunkify",
+    "aflatten",
     "camel_case",
+    "camel_case_many",
+    "chunked_map",
     "chunkify",
+    "chunkify_buffer",
+    "chunkify_by_size",
+    "chunkify_file",
+    "compile_path",
+    "convert_all",
     "deep_merge",
     "dot_case",
+    "dot_case_many",
     "flatten",
+    "flatten_dict",
     "hashify",
+    "hashify_cache_clear",
+    "hashify_cache_info",
+    "hashify_cache_invalidate",
+    "hashify_file",
+    "hashify_files",
+    "hashify_many",
+    "ichunkify",
     "kebab_case",
+    "kebab_case_many",
+    "normalize_cache_clear",
+    "normalize_cache_info",
     "pascal_case",
+    "pascal_case_many",
     "pretty_bytes",
+    "set_hashify_cache_size",
+    "set_normalize_cache_size",
     "slugify",
+    "slugify_many",
     "snake_case",
+    "snake_case_many",
     "timing",
     "train_case",
+    "train_case_many",
+    "transform_keys",
     "truncate",
+    "truncate_bytes",
+    "unflatten_dict",
+    "unique",
     "utcnow",
 ]
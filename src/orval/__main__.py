@@ -0,0 +1,8 @@
+"""Run the command-line interface with `python -m orval`."""
+
+import sys
+
+from orval.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
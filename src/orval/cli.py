@@ -0,0 +1,187 @@
+"""Command-line interface, streams stdin to stdout one line at a time.
+
+Examples
+--------
+    $ cat names.txt | python -m orval slugify
+    $ orval snake_case --field 2 --delimiter , --header < columns.csv
+    $ orval snake_case --csv --field 2 --header < quoted.csv
+    $ orval hashify --alg md5 < lines.txt
+    $ orval pretty_bytes --format bs --field 5 < ls.tsv
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import BinaryIO
+
+from orval.byte_utils import pretty_bytes
+from orval.hashing import hashify
+from orval.strings import camel_case, dot_case, kebab_case, pascal_case, slugify, snake_case, train_case
+
+# Number of transformed lines that are written to stdout at once.
+_WRITE_BATCH_SIZE: int = 1024
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the argument parser, with one subcommand per transformation."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-f", "--field", type=int, help="Only transform this field (1-based) of delimiter separated lines."
+    )
+    common.add_argument("-d", "--delimiter", help="Field delimiter (default is a tab, or a comma with --csv).")
+    common.add_argument("--csv", action="store_true", help="Parse fields as CSV, quoted fields may hold delimiters.")
+    common.add_argument("--header", action="store_true", help="Pass the first line through unchanged.")
+
+    parser = argparse.ArgumentParser(prog="orval", description="Transform stdin to stdout, one line at a time.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name in ("kebab_case", "snake_case", "dot_case"):
+        command = commands.add_parser(name, parents=[common], help=f"Convert to {name}.")
+        command.add_argument("--scream", action="store_true", help="Convert the output to uppercase.")
+        command.add_argument("--ascii", action="store_true", help="Only allow ASCII characters.")
+    for name in ("camel_case", "pascal_case"):
+        command = commands.add_parser(name, parents=[common], help=f"Convert to {name}.")
+        command.add_argument("--ascii", action="store_true", help="Only allow ASCII characters.")
+    command = commands.add_parser("train_case", parents=[common], help="Convert to train_case.")
+    command.add_argument("--unicode", action="store_true", help="Allow Unicode characters.")
+    commands.add_parser("slugify", parents=[common], help="Create a slug.")
+    command = commands.add_parser("hashify", parents=[common], help="Hash the content.")
+    command.add_argument("--alg", default="sha256", help="Hashing algorithm (default is sha256).")
+    command = commands.add_parser("pretty_bytes", parents=[common], help="Format a number of bytes.")
+    command.add_argument("--format", default="ds", choices=["ds", "dl", "bs", "bl"], help="Format (default is ds).")
+    command.add_argument("--precision", type=int, default=2, help="Number of decimal places (default is 2).")
+    return parser
+
+
+def _transformation(args: argparse.Namespace) -> Callable[[str], str]:  # noqa: PLR0911
+    """Resolve the parsed arguments to a function that transforms a single value."""
+    match args.command:
+        case "kebab_case" | "snake_case" | "dot_case":
+            func = {"kebab_case": kebab_case, "snake_case": snake_case, "dot_case": dot_case}[args.command]
+            return partial(func, scream=args.scream, unicode=not args.ascii)
+        case "camel_case":
+            return partial(camel_case, unicode=not args.ascii)
+        case "pascal_case":
+            return partial(pascal_case, unicode=not args.ascii)
+        case "train_case":
+            return partial(train_case, unicode=args.unicode)
+        case "hashify":
+            hashify("", alg=args.alg)  # Fail early on an unsupported algorithm
+            return lambda value: hashify(value, alg=args.alg)
+        case "pretty_bytes":
+            return lambda value: pretty_bytes(int(value), args.format, precision=args.precision)
+        case _:
+            return slugify
+
+
+def _field_codec(delimiter: str, quoted: bool) -> tuple[Callable[[str], list[str]], Callable[[list[str]], str]]:
+    """Resolve the functions that split a line into fields and join them back, optionally with CSV quoting."""
+    if not quoted:
+        return (lambda text: text.split(delimiter)), delimiter.join
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="")
+
+    def split(text: str) -> list[str]:
+        # Strict parsing reports unbalanced quotes instead of guessing, a record can't span lines.
+        return next(csv.reader([text], delimiter=delimiter, strict=True), [])
+
+    def join(fields: list[str]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(fields)
+        return buffer.getvalue()
+
+    return split, join
+
+
+def _transform_line(
+    line: bytes,
+    transform: Callable[[str], str],
+    field: int | None,
+    codec: tuple[Callable[[str], list[str]], Callable[[list[str]], str]],
+) -> bytes:
+    """Transform a line, or a single field of it, keeping the line ending intact."""
+    content = line.rstrip(b"\r\n")
+    ending = line[len(content) :]
+    text = content.decode()
+    if field is None:
+        return transform(text).encode() + ending
+    split, join = codec
+    fields = split(text)
+    if len(fields) < field:
+        # Lines without the selected field, e.g. empty lines, are passed through unchanged.
+        return line
+    fields[field - 1] = transform(fields[field - 1])
+    return join(fields).encode() + ending
+
+
+def _stream(stdin: BinaryIO, stdout: BinaryIO, transform: Callable[[str], str], args: argparse.Namespace) -> None:
+    """Transform stdin to stdout with bounded memory, writes are batched."""
+    batch: list[bytes] = []
+    codec = _field_codec(args.delimiter, args.csv)
+    for number, line in enumerate(stdin, start=1):
+        if number == 1 and args.header:
+            batch.append(line)
+            continue
+        try:
+            batch.append(_transform_line(line, transform, args.field, codec))
+        except (ValueError, csv.Error) as exc:
+            # Keep the lines before the failing one, like the batches that were already written
+            stdout.write(b"".join(batch))
+            stdout.flush()
+            raise ValueError(f"line {number}: {exc}") from exc
+        if len(batch) >= _WRITE_BATCH_SIZE:
+            stdout.write(b"".join(batch))
+            batch.clear()
+    stdout.write(b"".join(batch))
+    stdout.flush()
+
+
+def main(argv: Sequence[str] | None = None, stdin: BinaryIO | None = None, stdout: BinaryIO | None = None) -> int:
+    """Run the command-line interface.
+
+    Parameters
+    ----------
+    argv
+        Command-line arguments, defaults to `sys.argv[1:]`.
+    stdin
+        Binary input stream, defaults to the buffer of `sys.stdin`.
+    stdout
+        Binary output stream, defaults to the buffer of `sys.stdout`.
+
+    Returns
+    -------
+    int
+        Returns the exit code.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.field is not None and args.field < 1:
+        parser.error(f"Field must be > 0, invalid value {args.field}")
+    if args.delimiter is None:
+        args.delimiter = "," if args.csv else "\t"
+    if args.csv and len(args.delimiter) != 1:
+        parser.error(f"Delimiter must be a single character with --csv, invalid value '{args.delimiter}'")
+    try:
+        transform = _transformation(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    try:
+        _stream(
+            sys.stdin.buffer if stdin is None else stdin,
+            sys.stdout.buffer if stdout is None else stdout,
+            transform,
+            args,
+        )
+    except ValueError as exc:
+        sys.stderr.write(f"orval: error: {exc}\n")
+        return 1
+    except BrokenPipeError:
+        if stdout is not None:
+            raise
+        # The reader went away (e.g. `| head`), silence the error Python reports when flushing stdout at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
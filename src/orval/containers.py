@@ -1,10 +1,52 @@
 """Array utilities."""
 
-from collections.abc import Generator, Iterable
+import asyncio
+import math
+import mmap
+import os
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from contextlib import suppress
+from copy import deepcopy
+from functools import lru_cache, partial
 from itertools import islice
-from typing import Any, TypeVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, overload
+
+from orval.hashing import _VARIABLE_SIZE_ALGORITHMS, _digest
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
 
 T = TypeVar("T")
+R = TypeVar("R")
+
+# Exact types that are chunked by slicing instead of iterating.
+_SLICEABLE: set[type] = {list, tuple, range}
+
+# Exact types that are flattened without the slower `Iterable` ABC check.
+_CONTAINER_TYPES: set[type] = {list, tuple, set, frozenset}
+# Iterables that are never flattened.
+_ATOMIC_TYPES: tuple[type, ...] = (str, bytes, bytearray)
+# Exact types that are never flattened, checked before the slower `Iterable` ABC check.
+_SCALAR_TYPES: set[type] = {int, float, complex, bool, str, bytes, bytearray, type(None)}
+# Marks a key that is missing from a layer or an exhausted iterator, None is a valid value.
+_MISSING: Any = object()
+# Maximum number of compiled paths that are cached.
+_PATH_CACHE_SIZE: int = 4096
+# The Bloom filter derives its bit positions from two 64-bit halves of a digest.
+_BLOOM_DIGEST_SIZE: int = 16
 
 
 def chunkify(seq: Iterable[T], s: int) -> list[list[T]]:  # noqa: UP047
@@ -22,18 +64,280 @@ def chunkify(seq: Iterable[T], s: int) -> list[list[T]]:  # noqa: UP047
     list
         A list of chunks.
     """
+    return list(ichunkify(seq, s))
+
+
+@overload
+def ichunkify(seq: Iterable[T], s: int, as_tuple: Literal[False] = False) -> Iterator[list[T]]: ...  # noqa: UP047
+@overload
+def ichunkify(seq: Iterable[T], s: int, as_tuple: Literal[True]) -> Iterator[tuple[T, ...]]: ...  # noqa: UP047
+def ichunkify(seq: Iterable[T], s: int, as_tuple: bool = False) -> Iterator[list[T]] | Iterator[tuple[T, ...]]:  # noqa: UP047
+    """Lazily break an iterable into chunks of size S.
+
+    Chunks are yielded as they are produced, so only one chunk is held in memory at a time. Lists, tuples and ranges
+    are sliced directly.
+
+    Parameters
+    ----------
+    seq : Iterable
+        The iterable to chunk.
+    s : int
+        The size of each chunk.
+    as_tuple : bool
+        Yield tuples instead of lists, which are cheaper to allocate.
+
+    Returns
+    -------
+    Iterator
+        An iterator of chunks.
+    """
     if s < 1:
         raise ValueError(f"Size must be > 0, invalid value {s}")
+    if type(seq) in _SLICEABLE:
+        return _slice_chunks(seq, s, as_tuple)  # type: ignore[invalid-argument-type, invalid-return-type]
+    return _islice_chunks(iter(seq), s, as_tuple)  # type: ignore[invalid-return-type]
 
-    def _inner(_seq: Iterable[T], _s: int) -> Generator[list[T]]:
-        iterator = iter(_seq)
-        while True:
-            chunk = list(islice(iterator, _s))
-            if not chunk:
-                break
-            yield chunk
 
-    return list(_inner(seq, s))
+def _slice_chunks(seq: Sequence[T], s: int, as_tuple: bool) -> Generator[list[T] | tuple[T, ...]]:  # noqa: UP047
+    """Chunk a sequence by slicing it."""
+    chunk_type = tuple if as_tuple else list
+    for start in range(0, len(seq), s):
+        chunk = seq[start : start + s]
+        yield chunk if type(chunk) is chunk_type else chunk_type(chunk)
+
+
+def _islice_chunks(iterator: Iterator[T], s: int, as_tuple: bool) -> Generator[list[T] | tuple[T, ...]]:  # noqa: UP047
+    """Chunk an iterator by consuming S items at a time."""
+    chunk_type = tuple if as_tuple else list
+    while chunk := chunk_type(islice(iterator, s)):
+        yield chunk
+
+
+def chunkify_by_size(  # noqa: UP047
+    iterable: Iterable[T],
+    max_weight: int,
+    key: Callable[[T], int] = len,  # type: ignore[invalid-parameter-default]
+    max_items: int | None = None,
+    oversize: Literal["raise", "isolate", "skip"] = "raise",
+) -> Generator[tuple[list[T], int]]:
+    """Lazily break an iterable into chunks whose total weight stays within a limit, e.g. a payload size in bytes.
+
+    Items are added to a chunk in order until the next item would exceed 'max_weight' or 'max_items'. Use
+    `pretty_bytes` on the reported weight to log the size of each chunk.
+
+    Parameters
+    ----------
+    iterable : Iterable
+        The iterable to chunk.
+    max_weight : int
+        The maximum total weight of a chunk.
+    key : Callable, optional
+        Returns the weight of an item, defaults to `len`.
+    max_items : int, optional
+        The maximum number of items in a chunk. If None, only the weight is limited.
+    oversize : str
+        What to do with an item that weighs more than 'max_weight' on its own: "raise" a ValueError, "isolate" it in a
+        chunk of its own or "skip" it.
+
+    Returns
+    -------
+    Generator
+        A generator of (chunk, weight) tuples.
+    """
+    if max_weight < 1:
+        raise ValueError(f"Max weight must be > 0, invalid value {max_weight}")
+    if max_items is not None and max_items < 1:
+        raise ValueError(f"Max items must be > 0, invalid value {max_items}")
+    if oversize not in {"raise", "isolate", "skip"}:
+        raise ValueError(f"Oversize must be one of ['isolate', 'raise', 'skip'], invalid value '{oversize}'")
+    return _weighted_chunks(iterable, max_weight, key, max_items, oversize)
+
+
+def _weighted_chunks(  # noqa: UP047
+    iterable: Iterable[T], max_weight: int, key: Callable[[T], int], max_items: int | None, oversize: str
+) -> Generator[tuple[list[T], int]]:
+    """Yield chunks and their weight, see `chunkify_by_size`."""
+    chunk: list[T] = []
+    weight = 0
+    for index, item in enumerate(iterable):
+        item_weight = key(item)
+        if item_weight > max_weight:
+            if oversize == "raise":
+                raise ValueError(f"Item {index} weighs {item_weight}, more than the max weight of {max_weight}")
+            if oversize == "isolate":
+                # Flush first, so the items stay in input order.
+                if chunk:
+                    yield chunk, weight
+                    chunk, weight = [], 0
+                yield [item], item_weight
+            continue
+        if weight + item_weight > max_weight or len(chunk) == max_items:
+            yield chunk, weight
+            chunk, weight = [], 0
+        chunk.append(item)
+        weight += item_weight
+    if chunk:
+        yield chunk, weight
+
+
+def chunkify_buffer(buffer: "Buffer", s: int) -> Iterator[memoryview]:
+    """Break a bytes-like object into chunks of S bytes, without copying.
+
+    Works with anything that supports the buffer protocol, e.g. bytes, bytearray, memoryview, array.array and mmap.
+    Chunks are memoryview slices of the input.
+
+    Parameters
+    ----------
+    buffer : Buffer
+        The bytes-like object to chunk.
+    s : int
+        The size of each chunk in bytes.
+
+    Returns
+    -------
+    Iterator
+        An iterator of memoryview chunks.
+    """
+    if s < 1:
+        raise ValueError(f"Size must be > 0, invalid value {s}")
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        raise TypeError("Input must support the buffer protocol (bytes, bytearray, memoryview, array, mmap).") from None
+    if view.ndim != 1 or view.format != "B":
+        view = view.cast("B")
+    return _view_chunks(view, s)
+
+
+def chunkify_file(path: str | os.PathLike[str], s: int) -> Iterator[memoryview]:
+    """Break a file into chunks of S bytes by memory-mapping it.
+
+    Chunks are read-only memoryview slices of the mapped file, the file is not read into memory.
+
+    Parameters
+    ----------
+    path : str | PathLike
+        The file to chunk.
+    s : int
+        The size of each chunk in bytes.
+
+    Returns
+    -------
+    Iterator
+        An iterator of memoryview chunks.
+    """
+    if s < 1:
+        raise ValueError(f"Size must be > 0, invalid value {s}")
+    return _file_chunks(Path(path), s)
+
+
+def _view_chunks(view: memoryview, s: int) -> Generator[memoryview]:
+    """Slice a one-dimensional memoryview of bytes."""
+    for start in range(0, view.nbytes, s):
+        yield view[start : start + s]
+
+
+def _file_chunks(path: Path, s: int) -> Generator[memoryview]:
+    """Memory-map a file and slice it."""
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield from _view_chunks(view, s)
+    finally:
+        view.release()
+        # Chunks that are still referenced keep the map open, it is closed once they are garbage collected.
+        with suppress(BufferError):
+            mapped.close()
+
+
+def chunked_map(  # noqa: PLR0913, UP047
+    func: Callable[[list[T]], R],
+    iterable: Iterable[T],
+    size: int,
+    *,
+    executor: Executor | None = None,
+    max_in_flight: int | None = None,
+    ordered: bool = True,
+) -> Generator[R]:
+    """Apply a function to chunks of an iterable on an executor, with a bound on outstanding chunks.
+
+    The iterable is consumed lazily: a new chunk is only submitted when fewer than 'max_in_flight' chunks are
+    outstanding, which keeps memory bounded for any input size. If the function raises, the exception is re-raised
+    with a note on the index of the chunk that failed.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to apply to each chunk, e.g. a bulk insert. Must be picklable for process pools.
+    iterable : Iterable
+        The iterable to chunk.
+    size : int
+        The size of each chunk.
+    executor : Executor, optional
+        A thread or process pool. By default, a thread pool is created and shut down when done.
+    max_in_flight : int, optional
+        The maximum number of chunks submitted at once. Defaults to twice the number of CPUs.
+    ordered : bool
+        If True, results are yielded in input order. If False, results are yielded as they complete.
+
+    Returns
+    -------
+    Generator
+        The result of the function for each chunk.
+    """
+    if size < 1:
+        raise ValueError(f"Size must be > 0, invalid value {size}")
+    max_in_flight = 2 * (os.cpu_count() or 1) if max_in_flight is None else max_in_flight
+    if max_in_flight < 1:
+        raise ValueError(f"Max in flight must be > 0, invalid value {max_in_flight}")
+    return _chunked_map(func, ichunkify(iterable, size), executor, max_in_flight, ordered)
+
+
+def _chunked_map(  # noqa: UP047
+    func: Callable[[list[T]], R],
+    chunks: Iterator[list[T]],
+    executor: Executor | None,
+    max_in_flight: int,
+    ordered: bool,
+) -> Generator[R]:
+    """Submit chunks and yield their results, see `chunked_map`."""
+    pool = ThreadPoolExecutor() if executor is None else executor
+    # Outstanding futures and the index of their chunk, in submission order.
+    pending: dict[Future[R], int] = {}
+    try:
+        for index, chunk in enumerate(chunks):
+            pending[pool.submit(func, chunk)] = index
+            if len(pending) >= max_in_flight:
+                yield from _collect(pending, ordered)
+        while pending:
+            yield from _collect(pending, ordered)
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _collect(pending: dict[Future[R], int], ordered: bool) -> list[R]:  # noqa: UP047
+    """Wait for the oldest future, or for any future when unordered, and remove the finished ones."""
+    if ordered:
+        done = [next(iter(pending))]
+    else:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        done = sorted(finished, key=pending.__getitem__)
+    results = []
+    for future in done:
+        index = pending.pop(future)
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            exc.add_note(f"Raised while processing chunk {index}.")
+            raise
+    return results
 
 
 def flatten(seq: Iterable[T], depth: int | None = None) -> Generator[T]:  # noqa: UP047
@@ -56,42 +360,565 @@ def flatten(seq: Iterable[T], depth: int | None = None) -> Generator[T]:  # noqa
         raise ValueError(f"Depth must be >= 0, invalid value {depth}")
     if not isinstance(seq, Iterable):
         raise TypeError("Input must be an interable (list, set, range, tuple).")
-    if isinstance(seq, str):
+    if isinstance(seq, _ATOMIC_TYPES):
         yield seq
         return
 
-    def _flatten(_seq: Iterable[T], current_depth: int) -> Generator[T]:
-        if depth is not None and current_depth >= depth:
-            yield from _seq
-            return
-        for item in _seq:
-            if isinstance(item, Iterable) and not isinstance(item, str):
-                yield from _flatten(item, current_depth + 1)  # type: ignore[invalid-argument-type]
-            else:
-                yield item
+    # Explicit stack of iterators, one per nesting level, instead of a generator per level.
+    iterators = [iter(seq)]
+    while iterators:
+        expand = depth is None or len(iterators) <= depth
+        for item in iterators[-1]:
+            kind = type(item)
+            if (
+                expand
+                and kind not in _SCALAR_TYPES
+                and (kind in _CONTAINER_TYPES or (isinstance(item, Iterable) and not isinstance(item, _ATOMIC_TYPES)))
+            ):
+                iterators.append(iter(item))  # type: ignore[invalid-argument-type]
+                break
+            yield item
+        else:
+            iterators.pop()
+
+
+def achunkify(aiterable: AsyncIterable[T], size: int, max_wait: float | None = None) -> AsyncGenerator[list[T]]:  # noqa: UP047
+    """Break an async iterable into chunks of a size, or of whatever arrived within a maximum wait.
+
+    A chunk is yielded when it holds 'size' items or when 'max_wait' seconds have passed since its first item arrived,
+    whichever comes first. The wait does not poll: the next item is awaited with a timeout, and an item that arrives
+    after the timeout is kept for the next chunk.
+
+    Parameters
+    ----------
+    aiterable : AsyncIterable
+        The async iterable to chunk, e.g. a websocket or a queue reader.
+    size : int
+        The maximum size of each chunk.
+    max_wait : float, optional
+        The maximum number of seconds to wait for a chunk to fill up. If None, waits until the chunk is full.
+
+    Returns
+    -------
+    AsyncGenerator
+        An async generator of chunks.
+    """
+    if size < 1:
+        raise ValueError(f"Size must be > 0, invalid value {size}")
+    if max_wait is not None and max_wait <= 0:
+        raise ValueError(f"Max wait must be > 0, invalid value {max_wait}")
+    if max_wait is None:
+        return _achunks(aiterable, size)
+    return _achunks_timed(aiterable, size, max_wait)
+
+
+async def _achunks(aiterable: AsyncIterable[T], size: int) -> AsyncGenerator[list[T]]:  # noqa: UP047
+    """Chunk an async iterable by size only."""
+    chunk: list[T] = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _anext_or_missing(iterator: AsyncIterator[T]) -> T | object:  # noqa: UP047
+    """Await the next item, return the `_MISSING` sentinel when exhausted."""
+    try:
+        return await anext(iterator)
+    except StopAsyncIteration:
+        return _MISSING
+
+
+async def _achunks_timed(aiterable: AsyncIterable[T], size: int, max_wait: float) -> AsyncGenerator[list[T]]:  # noqa: UP047
+    """Chunk an async iterable by size or by time, whichever comes first."""
+    loop = asyncio.get_running_loop()
+    iterator = aiter(aiterable)
+    # The pending `anext` survives a timeout, so no item is lost between chunks.
+    pending: asyncio.Task[T | object] | None = None
+    chunk: list[T] = []
+    deadline = 0.0
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(_anext_or_missing(iterator))
+            timeout = max(deadline - loop.time(), 0) if chunk else None
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            if done:
+                item = pending.result()
+                pending = None
+                if item is _MISSING:
+                    break
+                if not chunk:
+                    deadline = loop.time() + max_wait
+                chunk.append(item)  # type: ignore[invalid-argument-type]
+                if len(chunk) < size:
+                    continue
+            yield chunk
+            chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait((pending,))
+
+
+def aflatten(aiterable: AsyncIterable[T], depth: int | None = None) -> AsyncGenerator[T]:  # noqa: UP047
+    """Flattens a nested async iterable up to a specified depth.
+
+    Nested async iterables and nested iterables are both flattened, with the same rules as `flatten`.
+
+    Parameters
+    ----------
+    aiterable : AsyncIterable
+        The async iterable to flatten.
+    depth : int, optional
+        The depth to flatten to. If None, flattens completely.
 
-    yield from _flatten(seq, 0)
+    Returns
+    -------
+    AsyncGenerator
+        The flattened async iterable.
+    """
+    if depth is not None and depth < 0:
+        raise ValueError(f"Depth must be >= 0, invalid value {depth}")
+    if not isinstance(aiterable, AsyncIterable):
+        raise TypeError("Input must be an async iterable.")
+    return _aflatten(aiterable, depth)
 
 
-def deep_merge(*dicts: dict[Any, Any]) -> dict[Any, Any]:
+async def _aflatten(aiterable: AsyncIterable[T], depth: int | None) -> AsyncGenerator[T]:  # noqa: UP047
+    """Flatten with an explicit stack of async iterators, see `aflatten`."""
+    iterators = [aiter(aiterable)]
+    while iterators:
+        level = len(iterators)
+        expand = depth is None or level <= depth
+        async for item in iterators[-1]:
+            if expand and isinstance(item, AsyncIterable):
+                iterators.append(aiter(item))
+                break
+            kind = type(item)
+            if (
+                expand
+                and kind not in _SCALAR_TYPES
+                and (kind in _CONTAINER_TYPES or (isinstance(item, Iterable) and not isinstance(item, _ATOMIC_TYPES)))
+            ):
+                for nested in flatten(item, None if depth is None else depth - level):  # type: ignore[invalid-argument-type]
+                    yield nested
+                continue
+            yield item
+        else:
+            iterators.pop()
+
+
+def deep_merge(*dicts: dict[Any, Any], copy: bool = False, into: dict[Any, Any] | None = None) -> dict[Any, Any]:
     """Deep merge multiple dictionaries.
 
+    All dictionaries are walked at once, per key, so every nested dictionary is only merged once no matter how many
+    layers there are. Subtrees that only one input contributes are reused, not copied.
+
     Parameters
     ----------
-      *dicts: One or more dictionaries to merge.
+      *dicts: One or more dictionaries to merge, later dictionaries take precedence.
+      copy: If True, deep copy the reused subtrees and values so the result shares nothing with the inputs.
+      into: Merge into this dictionary, in place, instead of into a new dictionary.
 
     Returns
     -------
     dict
         The merged dictionary.
     """
-    if not all(isinstance(d, dict) for d in dicts):
+    if not all(isinstance(d, dict) for d in dicts) or (into is not None and not isinstance(into, dict)):
         raise TypeError("All inputs must be dictionaries.")
-    result: dict[Any, Any] = {}
-    for d in dicts:
-        for k, v in d.items():
-            if k in result and isinstance(result[k], dict) and isinstance(v, dict):
-                result[k] = deep_merge(result[k], v)
+    target: dict[Any, Any] = {} if into is None else into
+    _merge_into(target, dicts, copy)
+    return target
+
+
+def _merge_into(target: dict[Any, Any], layers: Sequence[dict[Any, Any]], copy: bool) -> None:
+    """Merge all layers into the target in a single pass."""
+    # The values of every key over all layers, in order of first appearance.
+    values_by_key: dict[Any, list[Any]] = {}
+    for layer in layers:
+        for key, value in layer.items():
+            values = values_by_key.get(key)
+            if values is None:
+                values_by_key[key] = [value]
             else:
-                result[k] = v
-    return result
+                values.append(value)
+
+    for key, values in values_by_key.items():
+        # Only the trailing run of dictionaries is merged, everything before it is overwritten.
+        start = len(values)
+        while start and isinstance(values[start - 1], dict):
+            start -= 1
+        if start == 0 and isinstance(target.get(key), dict):
+            _merge_into(target[key], values, copy)
+        elif start >= len(values) - 1:
+            target[key] = deepcopy(values[-1]) if copy else values[-1]
+        else:
+            merged: dict[Any, Any] = {}
+            _merge_into(merged, values[start:], copy)
+            target[key] = merged
+
+
+class DeepChainMap(Mapping[Any, Any]):
+    """Read-only view that deeply merges layered dictionaries, later layers take precedence.
+
+    Like `collections.ChainMap`, but nested dictionaries are layered as well. Nothing is merged or copied up front, so
+    creating a view is cheap no matter the size of the layers. Keys are resolved when they are looked up, and nested
+    views are memoized per view. The layers should not be modified while the view is in use.
+
+    Parameters
+    ----------
+      *layers: One or more dictionaries to layer, later dictionaries take precedence.
+    """
+
+    __slots__ = ("_layers", "_views")
+
+    def __init__(self, *layers: dict[Any, Any]) -> None:
+        if not all(isinstance(layer, dict) for layer in layers):
+            raise TypeError("All inputs must be dictionaries.")
+        self._layers = layers
+        self._views: dict[Any, DeepChainMap] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        view = self._views.get(key)
+        if view is not None:
+            return view
+        # Walk the layers from the top, collecting dictionaries until a value that overrides them.
+        dicts: list[dict[Any, Any]] = []
+        for layer in reversed(self._layers):
+            value = layer.get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if not isinstance(value, dict):
+                if not dicts:
+                    return value
+                break
+            dicts.append(value)
+        if not dicts:
+            raise KeyError(key)
+        view = DeepChainMap(*reversed(dicts))
+        self._views[key] = view
+        return view
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Keys in order of first appearance, like `deep_merge`.
+        return iter(dict.fromkeys(key for layer in self._layers for key in layer))
+
+    def __len__(self) -> int:
+        return len(set().union(*self._layers))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self._layers))})"
+
+    def materialize(self) -> dict[Any, Any]:
+        """Deep merge the layers into a dictionary, the same as `deep_merge`.
+
+        Returns
+        -------
+        dict
+            The merged dictionary.
+        """
+        return deep_merge(*self._layers)
+
+
+def flatten_dict(d: dict[Any, Any], sep: str = ".") -> dict[str, Any]:
+    """Flatten a nested dictionary to a single level, joining the keys of nested dictionaries with a separator.
+
+    Empty nested dictionaries are kept as values, so `unflatten_dict` restores the original.
+
+    Parameters
+    ----------
+    d : dict
+        The dictionary to flatten.
+    sep : str
+        The separator between the keys.
+
+    Returns
+    -------
+    dict
+        The flattened dictionary, e.g. {"a.b.c": 1}.
+    """
+    if not isinstance(d, dict):
+        raise TypeError("Input must be a dictionary.")
+    if not sep:
+        raise ValueError("Separator must not be empty.")
+    flat: dict[str, Any] = {}
+    # Explicit stack of (prefix, items) per nesting level, in depth-first order.
+    stack = [("", iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            name = f"{prefix}{key}"
+            if isinstance(value, dict) and value:
+                stack.append((f"{name}{sep}", iter(value.items())))
+                break
+            flat[name] = value
+        else:
+            stack.pop()
+    return flat
+
+
+def unflatten_dict(d: dict[str, Any], sep: str = ".") -> dict[str, Any]:
+    """Nest a flat dictionary by splitting its keys on a separator, the inverse of `flatten_dict`.
+
+    Parameters
+    ----------
+    d : dict
+        The flat dictionary, e.g. {"a.b.c": 1}.
+    sep : str
+        The separator between the keys.
+
+    Returns
+    -------
+    dict
+        The nested dictionary.
+    """
+    if not isinstance(d, dict):
+        raise TypeError("Input must be a dictionary.")
+    if not sep:
+        raise ValueError("Separator must not be empty.")
+    nested: dict[str, Any] = {}
+    # Only dictionaries created here are nested into, dictionaries from the input are values and are never mutated.
+    created = {id(nested)}
+    for key, value in d.items():
+        # Split here instead of with `compile_path`, keys of records are mostly one-off and may be empty.
+        *parents, last = key.split(sep)
+        target = nested
+        for parent in parents:
+            child = target.get(parent, _MISSING)
+            if child is _MISSING:
+                child = target[parent] = {}
+                created.add(id(child))
+            elif id(child) not in created:
+                raise ValueError(f"Key '{key}' conflicts with a value at '{parent}'")
+            target = child
+        if last in target and (isinstance(target[last], dict) or isinstance(value, dict)):
+            raise ValueError(f"Key '{key}' conflicts with a nested key")
+        target[last] = value
+    return nested
+
+
+class CompiledPath:
+    """Accessor for a value in nested dictionaries, with the path split once up front.
+
+    Create instances with `compile_path`, which caches them per path.
+
+    Parameters
+    ----------
+    path : str
+        The path, e.g. "a.b.c".
+    sep : str
+        The separator between the keys.
+    """
+
+    __slots__ = ("keys", "path")
+
+    def __init__(self, path: str, sep: str = ".") -> None:
+        if not path:
+            raise ValueError("Path must not be empty.")
+        if not sep:
+            raise ValueError("Separator must not be empty.")
+        self.path = path
+        self.keys = tuple(path.split(sep))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+    def get(self, obj: Mapping[Any, Any], default: Any = None) -> Any:
+        """Get the value at the path, or the default if any key on the path is missing.
+
+        Parameters
+        ----------
+        obj : Mapping
+            The nested dictionary.
+        default : Any
+            Returned when the path does not exist.
+
+        Returns
+        -------
+        Any
+            The value at the path.
+        """
+        value: Any = obj
+        for key in self.keys:
+            try:
+                value = value[key]
+            except (KeyError, TypeError, IndexError):
+                return default
+        return value
+
+    def set(self, obj: dict[Any, Any], value: Any) -> None:
+        """Set the value at the path, creating missing nested dictionaries.
+
+        Parameters
+        ----------
+        obj : dict
+            The nested dictionary, modified in place.
+        value : Any
+            The value to set.
+        """
+        *parents, last = self.keys
+        target = obj
+        for key in parents:
+            try:
+                target = target[key]
+            except KeyError:
+                target[key] = target = {}
+            if not isinstance(target, dict):
+                raise TypeError(f"Path '{self.path}' is blocked by a value that is not a dictionary at '{key}'")
+        target[last] = value
+
+
+@lru_cache(maxsize=_PATH_CACHE_SIZE)
+def compile_path(path: str, sep: str = ".") -> CompiledPath:
+    """Compile a path to nested dictionaries, e.g. "a.b.c", to a reusable accessor.
+
+    Accessors are cached per path and separator, so the path is only split once no matter how many records are read
+    or written.
+
+    Parameters
+    ----------
+    path : str
+        The path, e.g. "a.b.c".
+    sep : str
+        The separator between the keys.
+
+    Returns
+    -------
+    CompiledPath
+        An accessor with `get` and `set` methods.
+    """
+    return CompiledPath(path, sep)
+
+
+class _BloomFilter:
+    """Fixed-size set of digests without false negatives, sized for a capacity and false positive rate."""
+
+    __slots__ = ("_bits", "_hashes", "_size")
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        # Optimal number of bits and hash functions, see https://en.wikipedia.org/wiki/Bloom_filter
+        self._size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, digest: bytes) -> bool:
+        """Add a digest of at least 16 bytes, return True if it was probably added before."""
+        # Derive all bit positions from two independent 64-bit halves of the digest (double hashing), a shorter digest
+        # would repeat its first half or give a step of 1 and cluster the bits.
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:16], "little") | 1
+        bits, size = self._bits, self._size
+        present = True
+        for i in range(self._hashes):
+            index = (first + i * step) % size
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                present = False
+        return present
+
+
+def unique(  # noqa: PLR0913, UP047
+    iterable: Iterable[T],
+    key: Callable[[T], Any] | None = None,
+    *,
+    alg: str = "blake2b",
+    digest_size: int | None = 16,
+    window: int | None = None,
+    false_positive_rate: float | None = None,
+    capacity: int = 1_000_000,
+) -> Generator[T]:
+    """Lazily drop duplicates from an iterable of any objects, including unhashable ones such as dicts and lists.
+
+    Only the binary digest of every distinct item is kept, not the item itself. Two modes bound memory for unbounded
+    streams: a sliding window that only remembers the last 'window' distinct items, or a Bloom filter of fixed size
+    that may drop a distinct item with a probability of 'false_positive_rate'.
+
+    Parameters
+    ----------
+    iterable : Iterable
+        The iterable to deduplicate, the first occurrence of every item is kept.
+    key : Callable, optional
+        Compares the result of the function instead of the items, e.g. `operator.itemgetter("id")`.
+    alg : str
+        Hashing algorithm to use (default is blake2b), see `hashify`.
+    digest_size : int, optional
+        Size of the digests in bytes for blake2b, blake2s, shake_128 and shake_256 (default is 16). Algorithms with a
+        fixed size, like sha256, use their full digest.
+    window : int, optional
+        Only remember the last 'window' distinct items.
+    false_positive_rate : float, optional
+        Use a Bloom filter with this false positive rate, e.g. 0.001. Needs digests of at least 16 bytes.
+    capacity : int
+        The number of distinct items the Bloom filter is sized for, the false positive rate rises beyond it.
+
+    Returns
+    -------
+    Generator
+        The distinct items in input order.
+    """
+    if window is not None and false_positive_rate is not None:
+        raise ValueError("Use either a window or a false positive rate, not both.")
+    if window is not None and window < 1:
+        raise ValueError(f"Window must be > 0, invalid value {window}")
+    if false_positive_rate is not None:
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"False positive rate must be between 0 and 1, invalid value {false_positive_rate}")
+        if capacity < 1:
+            raise ValueError(f"Capacity must be > 0, invalid value {capacity}")
+    digest_of = partial(_digest, alg=alg, digest_size=digest_size if alg in _VARIABLE_SIZE_ALGORITHMS else None)
+    size = len(digest_of(""))  # Fail early on an unsupported algorithm or digest size
+    if false_positive_rate is not None:
+        if size < _BLOOM_DIGEST_SIZE:
+            raise ValueError(f"A false positive rate needs digests of at least 16 bytes, invalid digest size {size}")
+        return _unique_bloom(iterable, key, digest_of, _BloomFilter(capacity, false_positive_rate))
+    if window is not None:
+        return _unique_window(iterable, key, digest_of, window)
+    return _unique(iterable, key, digest_of)
+
+
+def _unique(  # noqa: UP047
+    iterable: Iterable[T], key: Callable[[T], Any] | None, digest_of: Callable[[Any], bytes]
+) -> Generator[T]:
+    """Drop duplicates, remembering every distinct item."""
+    seen: set[bytes] = set()
+    for item in iterable:
+        digest = digest_of(item if key is None else key(item))
+        if digest not in seen:
+            seen.add(digest)
+            yield item
+
+
+def _unique_window(  # noqa: UP047
+    iterable: Iterable[T], key: Callable[[T], Any] | None, digest_of: Callable[[Any], bytes], window: int
+) -> Generator[T]:
+    """Drop duplicates, remembering the last distinct items only."""
+    seen: set[bytes] = set()
+    order: deque[bytes] = deque()
+    for item in iterable:
+        digest = digest_of(item if key is None else key(item))
+        if digest not in seen:
+            seen.add(digest)
+            order.append(digest)
+            if len(order) > window:
+                seen.remove(order.popleft())
+            yield item
+
+
+def _unique_bloom(  # noqa: UP047
+    iterable: Iterable[T], key: Callable[[T], Any] | None, digest_of: Callable[[Any], bytes], bloom: _BloomFilter
+) -> Generator[T]:
+    """Drop duplicates, and rarely a distinct item, in fixed memory."""
+    for item in iterable:
+        if not bloom.add(digest_of(item if key is None else key(item))):
+            yield item
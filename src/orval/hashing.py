@@ -1,18 +1,121 @@
 """Cryptographic hash for any Python object."""
 
 import hashlib
+import io
+import os
 import pickle  # noqa: S403
-from typing import Any
+import struct
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import fields
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, NamedTuple, TypeVar, overload
 
+from orval.utils import CacheInfo
 
-def hashify(obj: Any, alg: str = "sha256") -> str:
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+# Data is passed to the hasher in chunks of this size.
+_CHUNK_SIZE: int = 64 * 1024
+# Variable length algorithms and the length of their digest in bytes.
+_SHAKE_ALGORITHMS: set[str] = {"shake_128", "shake_256"}
+_SHAKE_LENGTH: int = 64
+# Algorithms with a configurable digest size, and their maximum size in bytes.
+_MAX_DIGEST_SIZES: dict[str, int] = {"blake2b": 64, "blake2s": 32}
+_VARIABLE_SIZE_ALGORITHMS: set[str] = _SHAKE_ALGORITHMS | set(_MAX_DIGEST_SIZES)
+# Hashers per algorithm and digest size, copied instead of creating and validating a new hasher every time.
+_PROTOTYPES: dict[tuple[str, int | None], Any] = {}
+# Formats of the hashes returned by `hashify`.
+_OUTPUTS: set[str] = {"hex", "bytes", "int"}
+# Default number of objects in the cache of `hashify(..., cache=True)`, and the types it holds next to frozen
+# dataclasses.
+_HASHIFY_CACHE_SIZE: int = 1024
+_CACHEABLE_TYPES: set[type] = {str, bytes, tuple, frozenset}
+# Immutable builtin types that cached tuples, frozensets and frozen dataclasses may be made of.
+_IMMUTABLE_SCALARS: set[type] = {str, bytes, int, float, complex, bool, type(None)}
+# Files are read in chunks of this size.
+_FILE_CHUNK_SIZE: int = 1024 * 1024
+# Default memory budget of the items or read buffers that are hashed at once.
+_MAX_IN_FLIGHT_BYTES: int = 256 * 1024 * 1024
+# Marks an object that isn't a plain tree, see `_PlainCopy`.
+_MISSING: Any = object()
+# First byte of the encoding of every object other than a string, which never starts valid UTF-8.
+_ENCODING_PREFIX: bytes = b"\xff"
+# Type tag followed by a length, a 64-bit integer or a float, in a fixed byte order.
+_HEADER = struct.Struct(">cQ")
+_INT = struct.Struct(">cq")
+_FLOAT = struct.Struct(">cd")
+# Integers outside of this range are encoded as a length and big-endian bytes.
+_INT_MIN: int = -(2**63)
+_INT_MAX: int = 2**63 - 1
+# Types of the leaves of plain trees, and of the keys of their dictionaries, which sort the same in every process.
+_SCALARS: set[type] = {str, int, float, bool, type(None), bytes}
+_SORTABLE_KEYS: set[type] = {str, int, bytes}
+_PLAIN_TYPES: set[type] = _SCALARS | {dict, list, tuple}
+# Plain trees are pickled at once, up to this depth and this many items in the containers that are copied. Longer
+# lists and tuples are split into segments, larger dictionaries are encoded entry by entry.
+_PLAIN_DEPTH: int = 8
+_PLAIN_BUDGET: int = 64 * 1024
+_SEGMENT_SIZE: int = 1024
+# Key orders of dictionaries whose sorted keys are kept at once while encoding an object.
+_ORDERS_SIZE: int = 1024
+# Type tags of containers, next to the inline tags of `_Encoder.encode`.
+_TAGS: dict[type, bytes] = {
+    bytes: b"b",
+    bytearray: b"B",
+    dict: b"d",
+    list: b"l",
+    tuple: b"t",
+    set: b"S",
+    frozenset: b"z",
+}
+
+
+@overload
+def hashify(
+    obj: Any, alg: str = ..., *, output: Literal["hex"] = ..., digest_size: int | None = ..., cache: bool = ...
+) -> str: ...
+@overload
+def hashify(
+    obj: Any, alg: str = ..., *, output: Literal["bytes"], digest_size: int | None = ..., cache: bool = ...
+) -> bytes: ...
+@overload
+def hashify(
+    obj: Any, alg: str = ..., *, output: Literal["int"], digest_size: int | None = ..., cache: bool = ...
+) -> int: ...
+def hashify(
+    obj: Any,
+    alg: str = "sha256",
+    *,
+    output: Literal["hex", "bytes", "int"] = "hex",
+    digest_size: int | None = None,
+    cache: bool = False,
+) -> str | bytes | int:
     """Compute a hash of any Python object.
 
     Handles both hashable and unhashable objects. For general-purpose cryptographic needs, SHA-256 is often the best
     choice due to its balance of security, speed, and widespread adoption.
 
+    Objects are walked and fed to the hasher as a canonical, type-tagged encoding in chunks, instead of pickling the
+    whole object up front. Dictionaries and sets hash the same regardless of their order, so the hash is stable across
+    processes. It is stable across Python versions as long as pickle writes builtin types the same way, which the tests
+    pin. Types other than str, bytes, int, float, bool, None and the built-in containers fall back to pickle. A string
+    hashes the same as its UTF-8 encoding hashed with hashlib, e.g. `hashlib.sha256(value.encode())`, other objects
+    never hash the same as a string.
+
     Output:
     - The function returns the hash as a hexadecimal string, making it suitable for storage and comparison.
+    - Use `output="bytes"` or `output="int"` to store the hash at half the size, or less with a smaller digest size.
     - This approach ensures the function works for a broad range of Python objects.
 
     Parameters
@@ -21,22 +124,688 @@ def hashify(obj: Any, alg: str = "sha256") -> str:
         The Python object to hash.
     alg : str, optional
         Hashing algorithm to use (default is sha256).
+    output : str, optional
+        Return the hash as "hex" string (default), raw "bytes" or an "int".
+    digest_size : int, optional
+        Size of the hash in bytes, for blake2b (up to 64), blake2s (up to 32), shake_128 and shake_256 (default is 64).
+    cache : bool, optional
+        Memoize the hash of immutable objects per object, see `set_hashify_cache_size`. Useful when the same large
+        tuple, frozenset, str, bytes or frozen dataclass is hashed over and over. Other objects are never cached.
+
+    Returns
+    -------
+    str, bytes or int
+        The hash of the object, by default a hexadecimal string.
+    """
+    if output not in _OUTPUTS:
+        raise ValueError(f"Output must be one of {sorted(_OUTPUTS)}, invalid value '{output}'")
+    digest = _cache.digest(obj, alg, digest_size) if cache else _digest(obj, alg, digest_size)
+    if output == "hex":
+        return digest.hex()
+    if output == "bytes":
+        return digest
+    return int.from_bytes(digest)
+
+
+def hashify_file(
+    file: str | os.PathLike[str] | BinaryIO, algs: Iterable[str] = ("sha256",), chunk_size: int = _FILE_CHUNK_SIZE
+) -> dict[str, str]:
+    """Compute one or more hashes of the content of a file in a single pass, without loading it into memory.
+
+    The file is read in chunks into a single reused buffer, and every chunk updates all hashers. For example, use
+    `algs=("sha256", "md5")` to get a checksum and the ETag of a single part S3 upload at once.
+
+    Parameters
+    ----------
+    file : str, PathLike or BinaryIO
+        A path, or a file object opened in binary mode. File objects are read from their current position.
+    algs : Iterable[str], optional
+        Hashing algorithms to use (default is sha256).
+    chunk_size : int, optional
+        Number of bytes read at once (default is 1 MiB).
 
     Returns
     -------
-    str
-        A hexadecimal string representing the hash of the object.
-    """
-    # Check if the requested algorithm is supported and avaiable by hashlib
-    # https://docs.python.org/3/library/hashlib.html
-    if alg not in hashlib.algorithms_guaranteed:
-        raise ValueError(f"Hashing algorithm '{alg}' not supported. Supported: {hashlib.algorithms_guaranteed}.")
-    hasher = hashlib.new(alg, usedforsecurity=False)
+    dict
+        A hexadecimal string per hashing algorithm.
+    """
+    algs = tuple(dict.fromkeys(algs))
+    if not algs:
+        raise ValueError("At least one hashing algorithm is required.")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be > 0, invalid value {chunk_size}")
+    hashers = {alg: _new_hasher(alg) for alg in algs}
+    if isinstance(file, (str, os.PathLike)):
+        with Path(file).open("rb", buffering=0) as fileobj:  # type: ignore[invalid-argument-type]
+            _read_into(fileobj, [hasher.update for hasher in hashers.values()], chunk_size)
+    elif isinstance(file, io.TextIOBase):
+        raise TypeError("File must be opened in binary mode.")
+    else:
+        _read_into(file, [hasher.update for hasher in hashers.values()], chunk_size)
+    return {alg: _finish(hasher, alg).hex() for alg, hasher in hashers.items()}
+
+
+def hashify_many(
+    items: Iterable[Any],
+    alg: str = "sha256",
+    workers: int | None = None,
+    max_in_flight_bytes: int = _MAX_IN_FLIGHT_BYTES,
+) -> Generator[tuple[int, str]]:
+    """Compute the hash of many objects, e.g. blobs, with a pool of threads.
+
+    hashlib releases the GIL while hashing large bytes, so large blobs are hashed in parallel. The items are sorted
+    by size, the largest first, so a large item doesn't hold up the end of the run. Results are yielded as they
+    finish, with the index of the item.
+
+    Parameters
+    ----------
+    items : Iterable
+        The Python objects to hash, all of them are collected up front to sort them.
+    alg : str, optional
+        Hashing algorithm to use (default is sha256).
+    workers : int, optional
+        Number of threads, defaults to the default of `ThreadPoolExecutor`.
+    max_in_flight_bytes : int, optional
+        Maximum total size of the str, bytes and bytearray items being hashed at once (default is 256 MiB). An item
+        larger than this is hashed on its own.
+
+    Returns
+    -------
+    Generator
+        Tuples of the index of an item and its hash, as hexadecimal string, in order of completion.
+    """
+    _new_hasher(alg)  # Fail early on an unsupported algorithm
+    _check_pool(workers, max_in_flight_bytes)
+    tasks = [(_size_of(item), index, partial(hashify, item, alg)) for index, item in enumerate(items)]
+    return _run_largest_first(tasks, workers, max_in_flight_bytes)
+
+
+def hashify_files(
+    paths: Iterable[str | os.PathLike[str]],
+    algs: Iterable[str] = ("sha256",),
+    workers: int | None = None,
+    chunk_size: int = _FILE_CHUNK_SIZE,
+    max_in_flight_bytes: int = _MAX_IN_FLIGHT_BYTES,
+) -> Generator[tuple[str | os.PathLike[str], dict[str, str]]]:
+    """Compute one or more hashes of many files with a pool of threads, see `hashify_file`.
+
+    The largest files are started first and results are yielded as they finish.
+
+    Parameters
+    ----------
+    paths : Iterable
+        Paths of the files, all of them are collected and their size looked up front.
+    algs : Iterable[str], optional
+        Hashing algorithms to use (default is sha256).
+    workers : int, optional
+        Number of threads, defaults to the default of `ThreadPoolExecutor`.
+    chunk_size : int, optional
+        Number of bytes read at once per file (default is 1 MiB).
+    max_in_flight_bytes : int, optional
+        Maximum total size of the read buffers of the files being hashed at once (default is 256 MiB).
+
+    Returns
+    -------
+    Generator
+        Tuples of the path of a file and a hexadecimal string per hashing algorithm, in order of completion.
+    """
+    algs = tuple(dict.fromkeys(algs))
+    hashify_file(io.BytesIO(), algs, chunk_size)  # Fail early on invalid algorithms or chunk size
+    _check_pool(workers, max_in_flight_bytes)
+    tasks = []
+    for path in paths:
+        size = Path(path).stat().st_size
+        # Small files get a buffer of their own size
+        buffer_size = max(1, min(size, chunk_size))
+        tasks.append((size, path, partial(hashify_file, path, algs, buffer_size)))
+    return _run_largest_first(tasks, workers, max_in_flight_bytes, chunk_size)
+
+
+def set_hashify_cache_size(maxsize: int | None) -> None:
+    """Resize the cache used by `hashify(..., cache=True)`.
+
+    The cache is keyed by object identity and only holds immutable objects: str, bytes, and tuples, frozensets and
+    frozen dataclasses made of str, bytes, int, float, complex, bool and None all the way down. Objects that support
+    weak references are not kept alive by the cache, other objects are held until they are evicted, so their identity
+    can't be reused. The least recently used object is evicted first. Resizing it drops all memoized entries and resets
+    the statistics.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of memoized objects. Use 0 to disable caching, or None for an unbounded cache.
+    """
+    global _cache  # noqa: PLW0603
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"Cache size must be >= 0 or None, invalid value {maxsize}")
+    _cache = _DigestCache(maxsize)
+
+
+def hashify_cache_info() -> CacheInfo:
+    """Report hits, misses, maxsize and current size of the cache used by `hashify(..., cache=True)`."""
+    return _cache.info()
+
+
+def hashify_cache_clear() -> None:
+    """Clear the cache used by `hashify(..., cache=True)` and reset its statistics."""
+    _cache.clear()
+
+
+def hashify_cache_invalidate(obj: Any) -> bool:
+    """Drop the memoized hashes of an object from the cache used by `hashify(..., cache=True)`.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to forget.
+
+    Returns
+    -------
+    bool
+        Returns True if the object was cached.
+    """
+    return _cache.invalidate(obj)
+
+
+def _check_pool(workers: int | None, max_in_flight_bytes: int) -> None:
+    """Fail on an invalid number of workers or memory budget."""
+    if workers is not None and workers < 1:
+        raise ValueError(f"Workers must be > 0, invalid value {workers}")
+    if max_in_flight_bytes < 1:
+        raise ValueError(f"Max in flight bytes must be > 0, invalid value {max_in_flight_bytes}")
+
+
+def _size_of(obj: Any) -> int:
+    """Return the size of the data of str, bytes and bytearray objects, others are encoded in small chunks."""
+    return len(obj) if isinstance(obj, (str, bytes, bytearray)) else 0
+
+
+def _run_largest_first(  # noqa: UP047
+    tasks: list[tuple[int, K, Callable[[], R]]],
+    workers: int | None,
+    max_in_flight_bytes: int,
+    max_buffer: int | None = None,
+) -> Generator[tuple[K, R]]:
+    """Run (size, key, function) tasks in a thread pool, largest first, and yield (key, result) as they finish.
+
+    Tasks are only submitted while the total size in flight, capped per task at 'max_buffer', fits the budget. At
+    least one task is always in flight, so a task larger than the budget runs on its own.
+    """
+    tasks.sort(key=itemgetter(0), reverse=True)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+    def _inner() -> Generator[tuple[K, R]]:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        # Outstanding futures with the key and the size of their task.
+        pending: dict[Future[R], tuple[K, int]] = {}
+        in_flight = 0
+        try:
+            for size, key, func in tasks:
+                weight = size if max_buffer is None else min(size, max_buffer)
+                while pending and (in_flight + weight > max_in_flight_bytes or len(pending) >= 2 * workers):
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        done_key, done_weight = pending.pop(future)
+                        in_flight -= done_weight
+                        yield done_key, _result(future, done_key)
+                pending[executor.submit(func)] = (key, weight)
+                in_flight += weight
+            for future in as_completed(list(pending)):
+                done_key, _ = pending.pop(future)
+                yield done_key, _result(future, done_key)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return _inner()
+
+
+def _result(future: Future[R], key: Any) -> R:  # noqa: UP047
+    """Return the result of a finished task, noting the key of the task on failure."""
+    try:
+        return future.result()
+    except Exception as exc:
+        exc.add_note(f"Raised while hashing {key!r}.")
+        raise
+
+
+def _read_into(fileobj: BinaryIO, updates: list[Callable[[bytes | memoryview], None]], chunk_size: int) -> None:
+    """Read a file object into a reused buffer and pass every chunk to all update functions."""
+    if not hasattr(fileobj, "readinto"):
+        # Minimal file-like objects only have `read`
+        while chunk := fileobj.read(chunk_size):
+            for update in updates:
+                update(chunk)
+        return
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        while size := fileobj.readinto(view):  # type: ignore[attr-defined]
+            chunk = view[:size] if size < chunk_size else view
+            for update in updates:
+                update(chunk)
+
+
+def _new_hasher(alg: str, digest_size: int | None = None) -> Any:
+    """Return a new hasher, copied from a prototype that is created and validated once per algorithm and size."""
+    if alg in _SHAKE_ALGORITHMS:
+        # The length of shake digests is only applied by `_finish`, so every length shares one prototype
+        if digest_size is not None and digest_size < 1:
+            raise ValueError(f"Digest size must be > 0, invalid value {digest_size}")
+        digest_size = None
+    prototype = _PROTOTYPES.get((alg, digest_size))
+    if prototype is None:
+        # Check if the requested algorithm is supported and avaiable by hashlib
+        # https://docs.python.org/3/library/hashlib.html
+        if alg not in hashlib.algorithms_guaranteed:
+            raise ValueError(f"Hashing algorithm '{alg}' not supported. Supported: {hashlib.algorithms_guaranteed}.")
+        if digest_size is None:
+            prototype = hashlib.new(alg, usedforsecurity=False)
+        elif alg in _MAX_DIGEST_SIZES:
+            if not 1 <= digest_size <= _MAX_DIGEST_SIZES[alg]:
+                raise ValueError(
+                    f"Digest size must be between 1 and {_MAX_DIGEST_SIZES[alg]} for {alg}, invalid value {digest_size}"
+                )
+            prototype = getattr(hashlib, alg)(digest_size=digest_size, usedforsecurity=False)
+        else:
+            raise ValueError(f"Digest size is only supported by blake2b, blake2s, shake_128 and shake_256, not {alg}.")
+        _PROTOTYPES[alg, digest_size] = prototype
+    return prototype.copy()
+
+
+def _finish(hasher: Any, alg: str, digest_size: int | None = None) -> bytes:
+    """Return the digest of a hasher, with a fixed length for variable length algorithms."""
+    if alg in _SHAKE_ALGORITHMS:
+        return hasher.digest(length=digest_size or _SHAKE_LENGTH)
+    return hasher.digest()
+
+
+def _digest(obj: Any, alg: str = "sha256", digest_size: int | None = None) -> bytes:
+    """Compute the binary digest of any Python object, half the size of the hexadecimal string of `hashify`."""
+    hasher = _new_hasher(alg, digest_size)
     if isinstance(obj, str):
+        # Plain strings are hashed as is, so their digest matches the digest of the encoded string
         hasher.update(obj.encode())
     else:
-        bytes_: bytes = pickle.dumps(obj, protocol=3)
-        hasher.update(bytes_)
-    if alg in {"shake_128", "shake_256"}:
-        return hasher.hexdigest(length=64)  # type: ignore[call-arg]
-    return hasher.hexdigest()
+        # Other objects start with a byte that never starts UTF-8, so they never hash the same as a string
+        hasher.update(_ENCODING_PREFIX)
+        encoder = _Encoder(hasher)
+        encoder.encode(obj)
+        encoder.flush()
+    return _finish(hasher, alg, digest_size)
+
+
+class _DigestCache:
+    """Thread-safe LRU cache of the digests of immutable objects, keyed by object identity."""
+
+    __slots__ = ("_entries", "_hits", "_lock", "_maxsize", "_misses")
+
+    def __init__(self, maxsize: int | None) -> None:
+        self._maxsize = maxsize
+        # Per object id, a guard that the id still belongs to the object, and its digests per algorithm and size.
+        self._entries: OrderedDict[int, tuple[Any, dict[tuple[str, int | None], bytes]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def digest(self, obj: Any, alg: str, digest_size: int | None) -> bytes:
+        """Return the memoized digest of an object, or compute and memoize it."""
+        if self._maxsize == 0 or (type(obj) not in _CACHEABLE_TYPES and not _is_frozen_dataclass(obj)):
+            return _digest(obj, alg, digest_size)
+        ident = id(obj)
+        with self._lock:
+            entry = self._entries.get(ident)
+            known = entry is not None and _guards(entry[0], obj)
+            if known:
+                digest = entry[1].get((alg, digest_size))  # type: ignore[not-subscriptable]
+                if digest is not None:
+                    self._hits += 1
+                    self._entries.move_to_end(ident)
+                    return digest
+            self._misses += 1
+        digest = _digest(obj, alg, digest_size)
+        # Objects that are already cached were immutable all the way down when they were added, so they still are.
+        if not known and not _is_immutable(obj):
+            return digest
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None or not _guards(entry[0], obj):
+                entry = self._entries[ident] = (_guard(obj), {})
+            entry[1][alg, digest_size] = digest
+            self._entries.move_to_end(ident)
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return digest
+
+    def invalidate(self, obj: Any) -> bool:
+        """Drop the digests of an object, return True if it was cached."""
+        with self._lock:
+            entry = self._entries.get(id(obj))
+            if entry is None or not _guards(entry[0], obj):
+                return False
+            del self._entries[id(obj)]
+            return True
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Report the statistics."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+
+def _is_frozen_dataclass(obj: Any) -> bool:
+    """Check if an object is an instance of a frozen dataclass that compares by its fields."""
+    params = getattr(type(obj), "__dataclass_params__", None)
+    return params is not None and params.frozen and params.eq
+
+
+def _is_immutable(obj: Any) -> bool:
+    """Check if a cacheable object is made of immutable builtin types all the way down.
+
+    Being hashable isn't enough: a tuple may hold an object that hashes by identity, and a frozen dataclass may have a
+    mutable field that isn't compared. Any other type would fall back to pickle, whose output may change over time.
+    """
+    stack, seen = [obj], set()
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind in _IMMUTABLE_SCALARS:
+            continue
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if kind is tuple or kind is frozenset:
+            stack.extend(item)
+        elif _is_frozen_dataclass(item) and _pickles_fields(item):
+            stack.extend(getattr(item, field.name) for field in fields(item))
+        else:
+            return False
+    return True
+
+
+def _pickles_fields(obj: Any) -> bool:
+    """Check if a dataclass instance pickles as its fields only, with the default reduce and state."""
+    kind = type(obj)
+    getstate = kind.__getstate__
+    if kind.__reduce_ex__ is not object.__reduce_ex__ or kind.__reduce__ is not object.__reduce__:
+        return False
+    # Frozen dataclasses with slots get a `__getstate__` from dataclasses that returns the fields
+    if getstate is not object.__getstate__ and getattr(getstate, "__module__", None) != "dataclasses":
+        return False
+    return not hasattr(obj, "__dict__") or vars(obj).keys() == {field.name for field in fields(obj)}
+
+
+def _guard(obj: Any) -> Any:
+    """Return a weak reference to an object if it supports one, or else the object itself."""
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return obj
+
+
+def _guards(guard: Any, obj: Any) -> bool:
+    """Check if a guard belongs to the object, and not to a collected object with the same id."""
+    return guard is obj or (type(guard) is weakref.ref and guard() is obj)
+
+
+class _Encoder:
+    """Canonical encoding of an object, streamed to a hasher in chunks.
+
+    Every value is tagged with its type and every variable-length value is prefixed with its length, so different
+    objects never encode the same. The entries of dictionaries and sets are sorted by the encoding of their keys, so the
+    order of insertion doesn't matter. Plain trees of builtin types are pickled at once, see `_PlainCopy`. Other types
+    fall back to pickle, which writes to the encoder as a file. A container that contains itself refers back to it by
+    its distance. Without a hasher, the encoding is kept in the buffer instead, e.g. to sort keys.
+    """
+
+    __slots__ = ("_active", "_buffer", "_hasher", "_keys", "_plain")
+
+    def __init__(self, hasher: Any, active: dict[int, int] | None = None, plain: "_PlainCopy | None" = None) -> None:
+        self._hasher = hasher
+        self._buffer = bytearray()
+        # Depth of the containers that are being encoded by id, and plain copies, shared with the encoders of keys.
+        self._active: dict[int, int] = {} if active is None else active
+        self._plain = _PlainCopy() if plain is None else plain
+        self._keys: dict[str, bytes] = {}
+
+    def write(self, data: bytes | bytearray) -> None:
+        """Write raw data, large data is passed on to the hasher without buffering."""
+        if self._hasher is not None and len(data) >= _CHUNK_SIZE:
+            self._hasher.update(self._buffer)
+            self._buffer.clear()
+            self._hasher.update(data)
+            return
+        self._buffer += data
+
+    def flush(self) -> None:
+        """Pass the buffered data on to the hasher."""
+        self._hasher.update(self._buffer)
+        self._buffer.clear()
+
+    def encode(self, obj: Any) -> None:  # noqa: C901, PLR0912, PLR0914, PLR0915
+        """Write the type-tagged encoding of an object, walking nested containers with an explicit stack."""
+        buffer, hasher, active, key_of, dump, plain = (
+            self._buffer,
+            self._hasher,
+            self._active,
+            self._key,
+            self._dump,
+            self._plain,
+        )
+        pack_header, pack_int, pack_float = _HEADER.pack, _INT.pack, _FLOAT.pack
+        # Iterators over the items of the containers being encoded, and the id of the container.
+        stack: list[tuple[Iterator[Any], int]] = [(iter((obj,)), 0)]
+        while stack:
+            items, container = stack[-1]
+            for item in items:
+                # The most common types first
+                kind = type(item)
+                if kind is str:
+                    data = item.encode("utf-8", "surrogatepass")
+                    buffer += pack_header(b"s", len(data))
+                    if len(data) < _CHUNK_SIZE:
+                        buffer += data
+                    else:
+                        self.write(data)
+                elif kind is int:
+                    if _INT_MIN <= item <= _INT_MAX:
+                        buffer += pack_int(b"q", item)
+                    else:
+                        data = item.to_bytes(item.bit_length() // 8 + 1, "big", signed=True)
+                        buffer += pack_header(b"i", len(data))
+                        buffer += data
+                elif kind is _Plain:
+                    buffer += b"P"
+                    dump(item.tree)
+                elif kind is _EncodedKey:
+                    buffer += item
+                elif kind is dict or kind is list or kind is tuple:
+                    ident = id(item)
+                    if ident in active:
+                        buffer += pack_header(b"r", len(active) - active[ident])
+                    elif kind is dict and len(item) <= _SEGMENT_SIZE and (tree := plain(item)) is not _MISSING:
+                        buffer += b"P"
+                        dump(tree)
+                    else:
+                        active[ident] = len(active)
+                        buffer += pack_header(_TAGS[kind], len(item))
+                        if kind is dict:
+                            entries = sorted([(key_of(key), value) for key, value in item.items()], key=itemgetter(0))
+                            stack.append((chain.from_iterable(entries), ident))
+                        else:
+                            stack.append((_segments(item, plain), ident))
+                        break
+                elif kind is float:
+                    buffer += pack_float(b"f", item)
+                elif item is None:
+                    buffer += b"N"
+                elif kind is bool:
+                    buffer += b"T" if item else b"F"
+                elif kind is bytes or kind is bytearray:
+                    buffer += pack_header(_TAGS[kind], len(item))
+                    self.write(item)
+                elif kind is set or kind is frozenset:
+                    buffer += pack_header(_TAGS[kind], len(item))
+                    for key in sorted(map(key_of, item)):
+                        buffer += key
+                else:
+                    buffer += b"p"
+                    pickle.dump(item, self, protocol=4)
+                if hasher is not None and len(buffer) >= _CHUNK_SIZE:
+                    hasher.update(buffer)
+                    buffer.clear()
+            else:
+                stack.pop()
+                active.pop(container, None)
+
+    def _dump(self, tree: Any) -> None:
+        """Pickle a plain tree to the encoder, with the pickler of this thread."""
+        sink, pickler = _pickler()
+        sink.target = self
+        try:
+            pickler.dump(tree)
+        finally:
+            sink.target = None
+
+    def _key(self, obj: Any) -> bytes:
+        """Encode a dictionary key or set item on its own, to sort by."""
+        if type(obj) is str:
+            # Keys of records repeat, e.g. in a list of dictionaries, so string keys are only encoded once.
+            encoded = self._keys.get(obj)
+            if encoded is None:
+                data = obj.encode("utf-8", "surrogatepass")
+                encoded = self._keys[obj] = _EncodedKey(_HEADER.pack(b"s", len(data)) + data)
+            return encoded
+        encoder = _Encoder(None, self._active, self._plain)
+        encoder.encode(obj)
+        return _EncodedKey(encoder._buffer)
+
+
+class _EncodedKey(bytes):
+    """Encoding of a dictionary key, written as is when it is encountered between the values."""
+
+    __slots__ = ()
+
+
+class _Plain(NamedTuple):
+    """Plain tree of a segment of a list or tuple, pickled at once when it is encountered between the items."""
+
+    tree: Any
+
+
+class _Sink:
+    """File the pickler of a thread writes to, passes the data on to the encoder that is dumping."""
+
+    __slots__ = ("target",)
+
+    def __init__(self) -> None:
+        self.target: _Encoder | None = None
+
+    def write(self, data: bytes) -> None:
+        self.target.write(data)  # type: ignore[possibly-missing-attribute]
+
+
+def _pickler() -> tuple[_Sink, pickle.Pickler]:
+    """Return the pickler of this thread, creating a pickler costs more than pickling a small tree."""
+    try:
+        return _local.pickler
+    except AttributeError:
+        sink = _Sink()
+        pickler = pickle.Pickler(sink, protocol=4)
+        # Without a memo, equal trees pickle the same whether or not they share objects.
+        pickler.fast = True
+        _local.pickler = sink, pickler
+        return _local.pickler
+
+
+def _segments(items: list[Any] | tuple[Any, ...], plain: "_PlainCopy") -> Generator[Any]:
+    """Yield the items of a list or tuple, with every segment that is a plain tree as a whole."""
+    size = len(items)
+    for start in range(0, size, _SEGMENT_SIZE):
+        segment = items if size <= _SEGMENT_SIZE else items[start : start + _SEGMENT_SIZE]
+        tree = plain(segment)
+        if tree is _MISSING:
+            yield from segment
+        else:
+            yield _Plain(tree)
+
+
+class _PlainCopy:
+    """Copy of plain trees with sorted dictionaries.
+
+    A plain tree is made of scalars and of dictionaries, lists and tuples, within `_PLAIN_DEPTH` and `_PLAIN_BUDGET`.
+    Its canonical copy is pickled in one go, which is a lot faster than encoding it item by item. The digests of plain
+    trees depend on the opcodes and frames that pickle writes for builtin types with protocol 4. CPython doesn't
+    promise to keep them, so `test__pinned_digests__success` pins the digests of nested plain data.
+    """
+
+    __slots__ = ("_budget", "_orders")
+
+    def __init__(self) -> None:
+        self._budget = 0
+        # Sorted keys per key order of the dictionaries, records in a list mostly share their keys.
+        self._orders: dict[tuple[tuple[Any, ...], tuple[type, ...]], tuple[Any, ...] | None] = {}
+
+    def __call__(self, obj: Any) -> Any:
+        """Return a copy of a plain tree, or `_MISSING` if the object isn't one."""
+        self._budget = _PLAIN_BUDGET
+        return self._copy(obj, 0)
+
+    def _copy(self, obj: Any, depth: int) -> Any:  # noqa: C901, PLR0911, PLR0912
+        """Copy an object, counting the items of the copied containers down from the budget."""
+        kind = type(obj)
+        if kind in _SCALARS:
+            return obj
+        if depth >= _PLAIN_DEPTH or (kind is not dict and kind is not list and kind is not tuple):
+            return _MISSING
+        self._budget -= len(obj)
+        if self._budget < 0:
+            return _MISSING
+        if kind is not dict:
+            types = set(map(type, obj))
+            if types <= _SCALARS:
+                # Lists and tuples of scalars pickle the same as their copy
+                return obj
+            if not types <= _PLAIN_TYPES:
+                return _MISSING
+            items = []
+            for value in obj:
+                if (item := self._copy(value, depth + 1)) is _MISSING:
+                    return _MISSING
+                items.append(item)
+            return items if kind is list else tuple(items)
+        types = set(map(type, obj.values()))
+        if not types <= _PLAIN_TYPES:
+            return _MISSING
+        keys = tuple(obj)
+        # Equal keys of different types, such as 1, 1.0 and True, must not share an order
+        layout = (keys, tuple(map(type, keys)))
+        order = self._orders.get(layout, _MISSING)
+        if order is _MISSING:
+            if len(self._orders) >= _ORDERS_SIZE:
+                self._orders.clear()
+            key_types = set(layout[1])
+            valid = len(key_types) <= 1 and key_types <= _SORTABLE_KEYS
+            order = self._orders[layout] = tuple(sorted(keys)) if valid else None
+        if order is None:
+            return _MISSING
+        if types <= _SCALARS:
+            # Dictionaries with sorted keys pickle the same as their copy
+            return obj if order == keys else {key: obj[key] for key in order}
+        tree = {}
+        for key in order:
+            if (item := self._copy(obj[key], depth + 1)) is _MISSING:
+                return _MISSING
+            tree[key] = item
+        return tree
+
+
+_local = threading.local()
+
+
+_cache = _DigestCache(_HASHIFY_CACHE_SIZE)
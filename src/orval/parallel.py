@@ -0,0 +1,81 @@
+"""Parallel bulk string casing."""
+
+import os
+from collections.abc import Generator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.context import BaseContext
+from typing import Any
+
+from orval.containers import chunked_map
+from orval.strings import _CASE_STYLES
+
+
+def _convert_chunk(style: str, chunk: list[str], options: dict[str, Any]) -> list[str]:
+    """Convert a chunk of strings in a worker process."""
+    return _CASE_STYLES[style](chunk, **options, as_list=True)  # type: ignore[return-value]
+
+
+def parallel_map_case(  # noqa: PLR0913
+    style: str,
+    strings: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunk_size: int = 1000,
+    max_in_flight: int | None = None,
+    mp_context: BaseContext | None = None,
+    **options: Any,
+) -> Generator[str]:
+    """Convert a large number of strings to a casing style using a pool of processes.
+
+    The strings are consumed lazily and sent to the workers in chunks. At most 'max_in_flight' chunks are queued or
+    being converted at any time, so memory stays flat regardless of the size of the input. Results are yielded in
+    input order.
+
+    Parameters
+    ----------
+    style
+        Name of the casing function, e.g. "slugify", "kebab_case" or "camel_case".
+    strings
+        Input strings to transform.
+    workers
+        Number of worker processes. Defaults to the number of CPUs.
+    chunk_size
+        Number of strings sent to a worker at once.
+    max_in_flight
+        Maximum number of chunks submitted to the pool at once. Defaults to twice the number of workers.
+    mp_context
+        Multiprocessing context used to start the workers, e.g. `multiprocessing.get_context("spawn")`.
+    **options
+        Options passed to the casing function, e.g. `scream=True` or `unicode=False`.
+
+    Returns
+    -------
+    Generator[str]
+        Returns the transformed strings in input order, close it to stop the workers early.
+    """
+    if style not in _CASE_STYLES:
+        raise ValueError(f"Style must be one of {sorted(_CASE_STYLES)}, invalid value '{style}'")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be > 0, invalid value {chunk_size}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"Workers must be > 0, invalid value {workers}")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers if max_in_flight is None else max_in_flight
+    if max_in_flight < 1:
+        raise ValueError(f"Max in flight must be > 0, invalid value {max_in_flight}")
+    # Fail early on invalid options instead of in the first worker
+    _CASE_STYLES[style]([], **options)
+
+    def _inner() -> Generator[str]:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+        convert = partial(_convert_chunk, style, options=options)
+        results = chunked_map(convert, strings, chunk_size, executor=executor, max_in_flight=max_in_flight)
+        try:
+            for chunk in results:
+                yield from chunk
+        finally:
+            results.close()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return _inner()
@@ -4,11 +4,42 @@ More info on casing naming conventions:
 https://en.wikipedia.org/wiki/Naming_convention_(programming)
 """
 
+import codecs
 import re
+import threading
 import unicodedata
+from collections.abc import Callable, Generator, Iterable, Iterator
+from functools import lru_cache, partial
+from typing import Any, Literal, overload
 
+from orval.utils import CacheInfo
 
-def _normalize(string: str, unicode: bool = True, compact_spaces: bool = True) -> str:
+# Characters that are replaced by a space: anything that is not a word character or whitespace, and underscores.
+_PUNCTUATION_RE = re.compile(r"[^\w\s]|_")
+
+# Translation table for the ASCII and Latin-1 ranges, derived from the pattern above so both stay in sync. Strings with
+# other code points go through the pattern itself, so the table has a fixed size.
+_PUNCTUATION_TABLE: dict[int, str] = {i: " " for i in range(256) if _PUNCTUATION_RE.match(chr(i))}
+_PUNCTUATION_TABLE_MAX: str = "\xff"
+
+# Default number of normalized strings that are memoized. See `set_normalize_cache_size`.
+_NORMALIZE_CACHE_SIZE: int = 4096
+
+# UTF-8 continuation bytes look like 0b10xxxxxx.
+_UTF8_CONTINUATION_MASK: int = 0b1100_0000
+_UTF8_CONTINUATION: int = 0b1000_0000
+
+# Maximum number of distinct strings remembered while converting a batch. See `_convert_many`.
+_BATCH_MEMO_SIZE: int = 65536
+
+# Maximum number of converted dictionary keys remembered by `transform_keys`.
+_KEY_CACHE_SIZE: int = 65536
+
+# Word boundaries inside camelCase and PascalCase keys: 'userId', 'user2Id' and 'HTTPStatus'.
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+
+def _normalize_text(string: str, unicode: bool, compact_spaces: bool) -> str:
     """Normalize a string for casing.
 
     Replace non-alphanumeric characters (except whitespace) with spaces. Leading and trailing whitespace will be stripped.
@@ -32,19 +63,62 @@ def _normalize(string: str, unicode: bool = True, compact_spaces: bool = True) -
     str
         Returns a transformed string.
     """
-    if unicode:
+    if string.isascii():
+        # NFKC and NFKD leave ASCII untouched, skip unicodedata altogether.
+        value = string
+    elif unicode:
         # Normalize the string to Normalization Form Compatibility Composition (NFKC).
         # This will replace multiple representation by a normalized one. E.g. 'ö' can have two representations.
         value = unicodedata.normalize("NFKC", string)
-        text = re.sub(r"[^\w\s]|_", " ", value, flags=re.UNICODE)
     else:
         # Normalize the string to Normalization Form Compatibility Decomposition (NFKD).
         # This will replace the diacritics by ASCII characters. E.g. 'ö' will be replaced by 'o' and 'ì' by 'i'.
         value = unicodedata.normalize("NFKD", string).encode("ascii", "ignore").decode("ascii")
-        text = re.sub(r"[^\w\s]|_", " ", value)
+    if value.isascii() or max(value) <= _PUNCTUATION_TABLE_MAX:
+        text = value.translate(_PUNCTUATION_TABLE)
+    else:
+        text = _PUNCTUATION_RE.sub(" ", value)
+
+    # Splitting on whitespace and joining with a single space compacts and strips in one go
+    return " ".join(text.split()) if compact_spaces else text.strip()
+
+
+_normalize_cached = lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)(_normalize_text)
+
+
+def _normalize(string: str, unicode: bool = True, compact_spaces: bool = True) -> str:
+    """Normalize a string for casing, memoized.
+
+    The cache is keyed on `(string, unicode, compact_spaces)`, repeated inputs skip the whole normalization pipeline.
+    See `_normalize_text` for the transformation itself.
+    """
+    return _normalize_cached(string, unicode, compact_spaces)
+
+
+def set_normalize_cache_size(maxsize: int | None) -> None:
+    """Resize the cache used by the casing functions.
 
-    # Replace multiple spaces with a single space
-    return re.sub(r"\s+", " ", text).strip() if compact_spaces else text.strip()
+    The cache is bounded and thread-safe. Resizing it drops all memoized entries and resets the statistics.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of memoized strings. Use 0 to disable caching, or None for an unbounded cache.
+    """
+    global _normalize_cached  # noqa: PLW0603
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"Cache size must be >= 0 or None, invalid value {maxsize}")
+    _normalize_cached = lru_cache(maxsize=maxsize)(_normalize_text)
+
+
+def normalize_cache_info() -> CacheInfo:
+    """Report hits, misses, maxsize and current size of the cache used by the casing functions."""
+    return CacheInfo(*_normalize_cached.cache_info())
+
+
+def normalize_cache_clear() -> None:
+    """Clear the cache used by the casing functions and reset its statistics."""
+    _normalize_cached.cache_clear()
 
 
 def kebab_case(string: str, scream: bool = False, unicode: bool = True, compact_spaces: bool = True) -> str:
@@ -207,6 +281,102 @@ def dot_case(string: str, scream: bool = False, unicode: bool = True, compact_sp
     return text.lower() if not scream else text.upper()
 
 
+class Casings:
+    """Every casing of a single string, built lazily from one normalization.
+
+    Each style is computed the first time it is accessed and reused afterwards. Use `convert_all` to create one.
+    """
+
+    __slots__ = ("_camel", "_capitalized", "_dot", "_kebab", "_lower", "_pascal", "_snake", "_train", "_words")
+
+    def __init__(self, words: list[str]) -> None:
+        self._words = words
+        self._lower: list[str] | None = None
+        self._capitalized: list[str] | None = None
+        self._snake: str | None = None
+        self._kebab: str | None = None
+        self._dot: str | None = None
+        self._camel: str | None = None
+        self._pascal: str | None = None
+        self._train: str | None = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({' '.join(self._words)!r})"
+
+    def _lower_words(self) -> list[str]:
+        if self._lower is None:
+            self._lower = [word.lower() for word in self._words]
+        return self._lower
+
+    def _capitalized_words(self) -> list[str]:
+        if self._capitalized is None:
+            self._capitalized = [word.capitalize() for word in self._words]
+        return self._capitalized
+
+    @property
+    def snake(self) -> str:
+        """The string in snake_case."""
+        if self._snake is None:
+            self._snake = "_".join(self._lower_words())
+        return self._snake
+
+    @property
+    def kebab(self) -> str:
+        """The string in kebab-case."""
+        if self._kebab is None:
+            self._kebab = "-".join(self._lower_words())
+        return self._kebab
+
+    @property
+    def dot(self) -> str:
+        """The string in dot.case."""
+        if self._dot is None:
+            self._dot = ".".join(self._lower_words())
+        return self._dot
+
+    @property
+    def camel(self) -> str:
+        """The string in camelCase."""
+        if self._camel is None:
+            self._camel = "".join([self._words[0].lower(), *self._capitalized_words()[1:]])
+        return self._camel
+
+    @property
+    def pascal(self) -> str:
+        """The string in PascalCase."""
+        if self._pascal is None:
+            self._pascal = "".join(self._capitalized_words())
+        return self._pascal
+
+    @property
+    def train(self) -> str:
+        """The string in Train-Case."""
+        if self._train is None:
+            self._train = "-".join(self._capitalized_words())
+        return self._train
+
+
+def convert_all(string: str, unicode: bool = True) -> Casings:
+    """Convert a string to every casing at once.
+
+    The string is normalized and split into words once, each casing is built the first time it is accessed. Note
+    that the same 'unicode' option applies to every casing, including train-case.
+
+    Parameters
+    ----------
+    string
+        Input string to transform.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+
+    Returns
+    -------
+    Casings
+        Returns an object with a 'snake', 'kebab', 'dot', 'camel', 'pascal' and 'train' attribute.
+    """
+    return Casings(_normalize(string, unicode=unicode).split(" "))
+
+
 def truncate(string: str, number: int, /, suffix: str = "...") -> str:
     """Truncate a string to a certain number of characters."""
     if number <= 0:
@@ -214,3 +384,527 @@ def truncate(string: str, number: int, /, suffix: str = "...") -> str:
     if len(string) <= number:
         return string
     return f"{string[: number - 1]}{suffix}"
+
+
+def truncate_bytes(string: str, max_bytes: int, /, suffix: str = "...", encoding: str = "utf-8") -> str:
+    """Truncate a string so it fits in a number of bytes once encoded, including the suffix.
+
+    The string is encoded once and cut at a character boundary, a character is never split. Useful for limits that
+    are expressed in bytes, like database columns or HTTP headers.
+
+    Parameters
+    ----------
+    string
+        Input string to truncate.
+    max_bytes
+        Maximum number of bytes of the encoded output, including the suffix.
+    suffix
+        Appended to the string when it is truncated.
+    encoding
+        Encoding used to measure the string (default is utf-8).
+
+    Returns
+    -------
+    str
+        Returns the truncated string.
+    """
+    if max_bytes <= 0:
+        raise ValueError("Max bytes must be a positive integer.")
+    data = string.encode(encoding)
+    if len(data) <= max_bytes:
+        return string
+    budget = max_bytes - len(suffix.encode(encoding))
+    if budget < 0:
+        raise ValueError(f"Suffix '{suffix}' does not fit in {max_bytes} bytes.")
+    if codecs.lookup(encoding).name == "utf-8":
+        # Step back over continuation bytes to the first byte of the character that doesn't fit.
+        while budget > 0 and data[budget] & _UTF8_CONTINUATION_MASK == _UTF8_CONTINUATION:
+            budget -= 1
+        return f"{data[:budget].decode(encoding)}{suffix}"
+    # Other encodings: drop the trailing bytes of an incomplete character.
+    return f"{data[:budget].decode(encoding, errors='ignore')}{suffix}"
+
+
+class SlugRegistry:
+    """Issue unique slugs, collisions are resolved with a numeric suffix (e.g. 'great-scott-2').
+
+    A counter is kept per base slug, so issuing a slug takes constant amortized time no matter how many collisions
+    there are. Issuing slugs is thread-safe.
+
+    Parameters
+    ----------
+    existing
+        Slugs that are already taken, e.g. the names of existing resources.
+    max_length
+        Maximum length of an issued slug. The base slug is cut to make room for the suffix.
+    """
+
+    def __init__(self, existing: Iterable[str] = (), max_length: int | None = None) -> None:
+        if max_length is not None and max_length < 1:
+            raise ValueError(f"Max length must be > 0, invalid value {max_length}")
+        self._max_length = max_length
+        self._taken: set[str] = set(existing)
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._taken
+
+    def __len__(self) -> int:
+        return len(self._taken)
+
+    def issue(self, string: str) -> str:
+        """Create a slug from a given string that has not been issued before.
+
+        Parameters
+        ----------
+        string
+            Input string to transform.
+
+        Returns
+        -------
+        str
+            Returns a unique slug.
+        """
+        base = slugify(string)
+        if self._max_length is not None:
+            base = base[: self._max_length].rstrip("-")
+        if not base:
+            raise ValueError(f"Can't create a slug from '{string}'")
+        with self._lock:
+            slug = base
+            if slug in self._taken:
+                counter = self._counters.get(base, 2)
+                while True:
+                    slug = self._suffixed(base, counter)
+                    counter += 1
+                    if slug not in self._taken:
+                        break
+                self._counters[base] = counter
+            self._taken.add(slug)
+        return slug
+
+    def _suffixed(self, base: str, counter: int) -> str:
+        suffix = f"-{counter}"
+        if self._max_length is None:
+            return f"{base}{suffix}"
+        if len(suffix) >= self._max_length:
+            raise ValueError(f"Max length {self._max_length} is too short to make '{base}' unique")
+        return f"{base[: self._max_length - len(suffix)].rstrip('-')}{suffix}"
+
+
+def _delimited_converter(join_char: str, scream: bool, unicode: bool, compact_spaces: bool) -> Callable[[str], str]:
+    """Build a kebab-case/snake_case/dot.case converter with all options resolved up front."""
+    normalize = _normalize_cached
+    change_case = str.upper if scream else str.lower
+
+    def convert(string: str) -> str:
+        return change_case(normalize(string, unicode, compact_spaces).replace(" ", join_char))
+
+    return convert
+
+
+def _dromedary_converter(upper: bool, join_char: str, unicode: bool) -> Callable[[str], str]:
+    """Build a camelCase/PascalCase/Train-Case converter with all options resolved up front."""
+    normalize = _normalize_cached
+    first_word = str.capitalize if upper else str.lower
+    capitalize = str.capitalize
+
+    def convert(string: str) -> str:
+        words = normalize(string, unicode, True).split(" ")  # noqa: FBT003
+        return join_char.join([first_word(words[0]), *map(capitalize, words[1:])])
+
+    return convert
+
+
+def _convert_many(strings: Iterable[str], convert: Callable[[str], str]) -> Generator[str]:
+    """Convert every string, strings that repeat within the batch are only converted once."""
+    memo: dict[str, str] = {}
+    for string in strings:
+        result = memo.get(string)
+        if result is None:
+            result = convert(string)
+            if len(memo) >= _BATCH_MEMO_SIZE:
+                memo.clear()
+            memo[string] = result
+        yield result
+
+
+def _many(strings: Iterable[str], convert: Callable[[str], str], as_list: bool) -> Iterator[str] | list[str]:
+    """Convert a batch of strings lazily, or eagerly into a list."""
+    results = _convert_many(strings, convert)
+    return list(results) if as_list else results
+
+
+@overload
+def kebab_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[False] = ...,
+) -> Iterator[str]: ...
+@overload
+def kebab_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[True],
+) -> list[str]: ...
+def kebab_case_many(
+    strings: Iterable[str],
+    scream: bool = False,
+    unicode: bool = True,
+    compact_spaces: bool = True,
+    *,
+    as_list: bool = False,
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to kebab-case.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    scream
+        Convert the output to uppercase.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+    compact_spaces
+        If True, multiple consecutive spaces are reduced to a single space (default is True).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _delimited_converter("-", scream, unicode, compact_spaces), as_list)
+
+
+@overload
+def slugify_many(strings: Iterable[str], *, as_list: Literal[False] = ...) -> Iterator[str]: ...
+@overload
+def slugify_many(strings: Iterable[str], *, as_list: Literal[True]) -> list[str]: ...
+def slugify_many(strings: Iterable[str], *, as_list: bool = False) -> Iterator[str] | list[str]:
+    """Create slugs from a batch of strings.
+
+    Strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _delimited_converter("-", scream=False, unicode=False, compact_spaces=True), as_list)
+
+
+@overload
+def camel_case_many(strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[False] = ...) -> Iterator[str]: ...
+@overload
+def camel_case_many(strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[True]) -> list[str]: ...
+def camel_case_many(
+    strings: Iterable[str], unicode: bool = True, *, as_list: bool = False
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to camelCase.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _dromedary_converter(upper=False, join_char="", unicode=unicode), as_list)
+
+
+@overload
+def pascal_case_many(
+    strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[False] = ...
+) -> Iterator[str]: ...
+@overload
+def pascal_case_many(strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[True]) -> list[str]: ...
+def pascal_case_many(
+    strings: Iterable[str], unicode: bool = True, *, as_list: bool = False
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to PascalCase.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _dromedary_converter(upper=True, join_char="", unicode=unicode), as_list)
+
+
+@overload
+def train_case_many(strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[False] = ...) -> Iterator[str]: ...
+@overload
+def train_case_many(strings: Iterable[str], unicode: bool = ..., *, as_list: Literal[True]) -> list[str]: ...
+def train_case_many(
+    strings: Iterable[str], unicode: bool = False, *, as_list: bool = False
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to train-case.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is False).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _dromedary_converter(upper=True, join_char="-", unicode=unicode), as_list)
+
+
+@overload
+def snake_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[False] = ...,
+) -> Iterator[str]: ...
+@overload
+def snake_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[True],
+) -> list[str]: ...
+def snake_case_many(
+    strings: Iterable[str],
+    scream: bool = False,
+    unicode: bool = True,
+    compact_spaces: bool = True,
+    *,
+    as_list: bool = False,
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to snake_case.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    scream
+        Convert the output to uppercase.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+    compact_spaces
+        If True, multiple consecutive spaces are reduced to a single space (default is True).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _delimited_converter("_", scream, unicode, compact_spaces), as_list)
+
+
+@overload
+def dot_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[False] = ...,
+) -> Iterator[str]: ...
+@overload
+def dot_case_many(
+    strings: Iterable[str],
+    scream: bool = ...,
+    unicode: bool = ...,
+    compact_spaces: bool = ...,
+    *,
+    as_list: Literal[True],
+) -> list[str]: ...
+def dot_case_many(
+    strings: Iterable[str],
+    scream: bool = False,
+    unicode: bool = True,
+    compact_spaces: bool = True,
+    *,
+    as_list: bool = False,
+) -> Iterator[str] | list[str]:
+    """Convert a batch of strings to dot.case.
+
+    Options are resolved once for the whole batch and strings that repeat within the batch are converted once.
+
+    Parameters
+    ----------
+    strings
+        Input strings to transform.
+    scream
+        Convert the output to uppercase.
+    unicode
+        If True, allows Unicode characters in the output string. If False, only ASCII characters are allowed (default is True).
+    compact_spaces
+        If True, multiple consecutive spaces are reduced to a single space (default is True).
+    as_list
+        If True, return a list instead of a lazy iterator.
+
+    Returns
+    -------
+    Iterator[str] | list[str]
+        Returns the transformed strings in input order.
+    """
+    return _many(strings, _delimited_converter(".", scream, unicode, compact_spaces), as_list)
+
+
+# Casing functions by name, for entry points that select a style at runtime.
+_CASE_FUNCTIONS: dict[str, Callable[[str], str]] = {
+    "camel_case": camel_case,
+    "dot_case": dot_case,
+    "kebab_case": kebab_case,
+    "pascal_case": pascal_case,
+    "slugify": slugify,
+    "snake_case": snake_case,
+    "train_case": train_case,
+}
+_CASE_STYLES: dict[str, Callable[..., Iterator[str] | list[str]]] = {
+    "camel_case": camel_case_many,
+    "dot_case": dot_case_many,
+    "kebab_case": kebab_case_many,
+    "pascal_case": pascal_case_many,
+    "slugify": slugify_many,
+    "snake_case": snake_case_many,
+    "train_case": train_case_many,
+}
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _convert_key(style: str, split_words: bool, key: str) -> str:
+    """Convert a dictionary key, memoized for all calls of `transform_keys` in this process."""
+    if split_words:
+        key = _CAMEL_BOUNDARY_RE.sub(" ", key)
+    return _CASE_FUNCTIONS[style](key)
+
+
+def transform_keys(obj: Any, style: str, *, in_place: bool = False, split_words: bool = False) -> Any:
+    """Convert the keys of nested dictionaries to a casing style, e.g. for JSON payloads.
+
+    Dictionaries and lists are walked iteratively, so the nesting depth is not limited by the recursion limit. Only
+    string keys are converted, values are reused as-is. Converted keys are memoized for the whole process. When two
+    keys convert to the same key, the last one wins.
+
+    Like the casing functions, words are separated by whitespace and punctuation: 'user_id' becomes 'userId' with
+    "camel_case", but 'userId' becomes 'userid' with "snake_case". Use 'split_words' to convert camelCase keys back.
+
+    Parameters
+    ----------
+    obj
+        A dictionary, a list, or any other value (which is returned as-is).
+    style
+        Name of the casing function, e.g. "snake_case" or "camel_case".
+    in_place
+        If True, rewrite the keys of the given dictionaries instead of building new dictionaries and lists.
+    split_words
+        If True, also separate words at camelCase and PascalCase boundaries, e.g. 'userId' becomes 'user_id' and
+        'HTTPStatus' becomes 'http_status' with "snake_case".
+
+    Returns
+    -------
+    Any
+        Returns the object with converted keys.
+    """
+    if style not in _CASE_FUNCTIONS:
+        raise ValueError(f"Style must be one of {sorted(_CASE_FUNCTIONS)}, invalid value '{style}'")
+    convert = partial(_convert_key, style, split_words)
+    if in_place:
+        _transform_keys_in_place(obj, convert)
+        return obj
+    return _transform_keys_copy(obj, convert)
+
+
+def _transform_keys_in_place(obj: Any, convert: Callable[[str], str]) -> None:
+    """Rewrite the keys of all nested dictionaries, keeping their order."""
+    stack = [obj]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            items = list(node.items())
+            node.clear()
+            for key, value in items:
+                node[convert(key) if isinstance(key, str) else key] = value
+            stack.extend(value for _, value in items if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+
+def _transform_keys_copy(obj: Any, convert: Callable[[str], str]) -> Any:
+    """Build new dictionaries and lists with converted keys, sharing every other value."""
+    if not isinstance(obj, (dict, list)):
+        return obj
+    # Maps the id of each source container to its copy, shared containers are converted once.
+    copies: dict[int, Any] = {id(obj): {} if isinstance(obj, dict) else []}
+    stack = [obj]
+
+    def copy(value: Any) -> Any:
+        if not isinstance(value, (dict, list)):
+            return value
+        if id(value) not in copies:
+            copies[id(value)] = {} if isinstance(value, dict) else []
+            stack.append(value)
+        return copies[id(value)]
+
+    while stack:
+        source = stack.pop()
+        target = copies[id(source)]
+        if isinstance(source, dict):
+            for key, value in source.items():
+                target[convert(key) if isinstance(key, str) else key] = copy(value)
+        else:
+            target.extend(copy(value) for value in source)
+    return copies[id(obj)]
@@ -4,11 +4,20 @@ import logging
 import time
 from collections.abc import Callable
 from functools import partial
-from typing import Any, TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 R = TypeVar("R")
 
 
+class CacheInfo(NamedTuple):
+    """Statistics of a cache, like the ones reported by `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
 def timing(func: Callable[..., R] | None = None, level: int = logging.INFO) -> Any:  # noqa: UP047
     """Log the elapsed time of a function.
 
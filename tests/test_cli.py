@@ -0,0 +1,103 @@
+"""Tests for the command-line interface."""
+
+from io import BytesIO
+
+import pytest
+
+from orval import hashify
+from orval.cli import main
+
+
+def run(argv: list[str], data: bytes) -> bytes:
+    """Run the command-line interface on the data and return the output."""
+    stdout = BytesIO()
+    assert main(argv, stdin=BytesIO(data), stdout=stdout) == 0
+    return stdout.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("argv", "data", "expected"),
+    [
+        (["slugify"], "Great Scott!!\nGréat Scött\n".encode(), b"great-scott\ngreat-scott\n"),
+        (["kebab_case"], "Gréat Scött\r\n".encode(), "gréat-scött\r\n".encode()),
+        (["kebab_case", "--scream", "--ascii"], "Gréat Scött".encode(), b"GREAT-SCOTT"),
+        (["snake_case"], b"Great Scott\n\n", b"great_scott\n\n"),
+        (["dot_case"], b"Great Scott\n", b"great.scott\n"),
+        (["camel_case"], b"great scott\n", b"greatScott\n"),
+        (["pascal_case"], b"great scott\n", b"GreatScott\n"),
+        (["train_case"], b"content type\n", b"Content-Type\n"),
+        (["hashify", "--alg", "md5"], b"great\n", f"{hashify('great', alg='md5')}\n".encode()),
+        (["pretty_bytes", "--format", "bs"], b"1024\n1048576\n", b"1.00 KiB\n1.00 MiB\n"),
+        (["slugify"], b"", b""),
+    ],
+)
+def test_transform(argv: list[str], data: bytes, expected: bytes) -> None:
+    """Should transform every line and keep the line endings."""
+    assert run(argv, data) == expected
+
+
+def test_field() -> None:
+    """Should only transform the selected field."""
+    data = b"id,name,size\n1,Great Scott,1000\n2,McFly,2000000\n\n"
+    assert run(["snake_case", "-f", "2", "-d", ",", "--header"], data) == (
+        b"id,name,size\n1,great_scott,1000\n2,mcfly,2000000\n\n"
+    )
+    assert run(["pretty_bytes", "--field", "3", "--delimiter", ",", "--header", "--precision", "0"], data) == (
+        b"id,name,size\n1,Great Scott,1 KB\n2,McFly,2 MB\n\n"
+    )
+
+
+def test_csv_field() -> None:
+    """Should keep quoted delimiters inside their field with --csv."""
+    data = b'id,name,size\n1,"McFly, Marty",1000\n2,"Doc ""Emmett"" Brown",2000000\n\n'
+    assert run(["snake_case", "--csv", "-f", "2", "--header"], data) == (
+        b"id,name,size\n1,mcfly_marty,1000\n2,doc_emmett_brown,2000000\n\n"
+    )
+    assert run(["pascal_case", "--csv", "-f", "2", "-d", ";"], b'1;"McFly; Marty";"1,000"\n') == (
+        b"1;McflyMarty;1,000\n"
+    )
+
+
+def test_batched_writes() -> None:
+    """Should stream more lines than fit in a single write batch."""
+    data = b"".join(f"Great Scott {i}\n".encode() for i in range(5000))
+    assert run(["slugify"], data) == b"".join(f"great-scott-{i}\n".encode() for i in range(5000))
+
+
+@pytest.mark.parametrize(
+    ("argv", "data", "message"),
+    [
+        (["pretty_bytes"], b"1000\ngreat scott\n", "line 2: invalid literal for int()"),
+        (["slugify"], b"\xff\n", "line 1: 'utf-8' codec can't decode byte 0xff"),
+        (["slugify", "--csv", "-f", "2"], b'1,"McFly\n', "line 1: unexpected end of data"),
+    ],
+)
+def test_invalid_data(argv: list[str], data: bytes, message: str, capsys: pytest.CaptureFixture[str]) -> None:
+    """Should report the line that can't be transformed."""
+    assert main(argv, stdin=BytesIO(data), stdout=BytesIO()) == 1
+    assert message in capsys.readouterr().err
+
+
+def test_invalid_data_keeps_previous_lines() -> None:
+    """Should write every line before the one that can't be transformed, in the last batch and the ones before."""
+    data = b"".join(f"{i}\n".encode() for i in range(1500)) + b"great scott\n1985\n"
+    stdout = BytesIO()
+    assert main(["pretty_bytes", "--format", "bs", "--precision", "0"], stdin=BytesIO(data), stdout=stdout) == 1
+    assert stdout.getvalue() == run(["pretty_bytes", "--format", "bs", "--precision", "0"], data[: data.index(b"g")])
+
+
+@pytest.mark.parametrize(
+    ("argv", "message"),
+    [
+        (["sarcasm_case"], "invalid choice: 'sarcasm_case'"),
+        (["slugify", "--field", "0"], "Field must be > 0, invalid value 0"),
+        (["slugify", "--csv", "-d", "::"], "Delimiter must be a single character with --csv, invalid value '::'"),
+        (["hashify", "--alg", "unsupported_alg"], "Hashing algorithm 'unsupported_alg' not supported."),
+    ],
+)
+def test_invalid_arguments(argv: list[str], message: str, capsys: pytest.CaptureFixture[str]) -> None:
+    """Should exit with a usage error."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(argv, stdin=BytesIO(), stdout=BytesIO())
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
@@ -1,12 +1,38 @@
 """Tests for chunkify function."""
 
-from collections.abc import Iterable
-from typing import Any
+import asyncio
+import mmap
+from array import array
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import pytest
 from typeguard import suppress_type_checks
 
-from orval import chunkify, deep_merge, flatten
+from orval import (
+    DeepChainMap,
+    achunkify,
+    aflatten,
+    chunked_map,
+    chunkify,
+    chunkify_buffer,
+    chunkify_by_size,
+    chunkify_file,
+    compile_path,
+    deep_merge,
+    flatten,
+    flatten_dict,
+    ichunkify,
+    unflatten_dict,
+    unique,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
 
 
 @pytest.mark.parametrize(
@@ -33,6 +59,199 @@ def test_chunkify_invalid_size(size: int) -> None:
         chunkify([1, 2, 3], size)
 
 
+@pytest.mark.parametrize(
+    ("sequence", "size", "expected"),
+    [
+        ([1, 2, 3, 4, 5], 2, [[1, 2], [3, 4], [5]]),
+        ((1, 2, 3), 5, [[1, 2, 3]]),
+        (range(5), 2, [[0, 1], [2, 3], [4]]),
+        ({1, 2, 3}, 2, [[1, 2], [3]]),
+        (iter("abc"), 2, [["a", "b"], ["c"]]),
+        ([], 2, []),
+    ],
+)
+def test_ichunkify(sequence: Iterable[Any], size: int, expected: list[list[Any]]) -> None:
+    """Should lazily yield lists, or tuples, of the given size."""
+    chunks = ichunkify(sequence, size)
+    assert isinstance(chunks, Iterator)
+    assert list(chunks) == expected
+
+
+@pytest.mark.parametrize("sequence", [[1, 2, 3, 4, 5], (1, 2, 3, 4, 5), range(1, 6), iter([1, 2, 3, 4, 5])])
+def test_ichunkify_as_tuple(sequence: Iterable[int]) -> None:
+    """Should yield tuples."""
+    assert list(ichunkify(sequence, 2, as_tuple=True)) == [(1, 2), (3, 4), (5,)]
+
+
+def test_ichunkify_lazy() -> None:
+    """Should yield chunks of an infinite iterable as they are produced."""
+    chunks = ichunkify(count(), 3)
+    assert next(chunks) == [0, 1, 2]
+    assert next(chunks) == [3, 4, 5]
+
+
+def test_ichunkify_invalid_size() -> None:
+    """Should raise a ValueError for invalid size, before any chunk is consumed."""
+    with pytest.raises(ValueError, match="Size must be > 0, invalid value 0"):
+        ichunkify(count(), 0)
+
+
+@pytest.mark.parametrize(
+    "buffer",
+    [b"great scott", bytearray(b"great scott"), memoryview(b"great scott"), array("B", b"great scott")],
+)
+def test_chunkify_buffer(buffer: "Buffer") -> None:
+    """Should yield memoryview slices of the given size."""
+    chunks = list(chunkify_buffer(buffer, 4))
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert [bytes(chunk) for chunk in chunks] == [b"grea", b"t sc", b"ott"]
+
+
+def test_chunkify_buffer_zero_copy() -> None:
+    """Should not copy the input."""
+    buffer = bytearray(b"great scott")
+    chunks = list(chunkify_buffer(buffer, 6))
+    buffer[:5] = b"GREAT"
+    assert bytes(chunks[0]) == b"GREAT "
+
+
+def test_chunkify_buffer_items() -> None:
+    """Should chunk arrays of wider items by bytes."""
+    buffer = array("I", [1, 2, 3])
+    assert [len(chunk) for chunk in chunkify_buffer(buffer, 8)] == [8, 4]
+    mapped = mmap.mmap(-1, 10)
+    assert [len(chunk) for chunk in chunkify_buffer(mapped, 4)] == [4, 4, 2]
+
+
+@suppress_type_checks
+def test_chunkify_buffer_invalid_type() -> None:
+    """Should raise a TypeError for objects without the buffer protocol."""
+    with pytest.raises(TypeError, match="Input must support the buffer protocol"):
+        chunkify_buffer([1, 2, 3], 2)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"), [(4, [b"grea", b"t sc", b"ott"]), (11, [b"great scott"]), (64, [b"great scott"])]
+)
+def test_chunkify_file(tmp_path: Path, size: int, expected: list[bytes]) -> None:
+    """Should yield read-only memoryview slices of a memory-mapped file."""
+    path = tmp_path / "marty.txt"
+    path.write_bytes(b"great scott")
+    chunks = list(chunkify_file(path, size))
+    assert [bytes(chunk) for chunk in chunks] == expected
+    assert all(chunk.readonly for chunk in chunks)
+
+
+def test_chunkify_file_empty(tmp_path: Path) -> None:
+    """Should yield nothing for an empty file."""
+    path = tmp_path / "empty.txt"
+    path.touch()
+    assert list(chunkify_file(str(path), 4)) == []
+
+
+@pytest.mark.parametrize(
+    ("max_items", "expected"),
+    [
+        (None, [(["great", "scott"], 10), (["mcfly", "doc"], 8), (["1955"], 4)]),
+        (1, [(["great"], 5), (["scott"], 5), (["mcfly"], 5), (["doc"], 3), (["1955"], 4)]),
+    ],
+)
+def test_chunkify_by_size(max_items: int | None, expected: list[tuple[list[str], int]]) -> None:
+    """Should yield chunks and their weight, without exceeding the max weight or max items."""
+    items = ["great", "scott", "mcfly", "doc", "1955"]
+    assert list(chunkify_by_size(items, 10, max_items=max_items)) == expected
+
+
+def test_chunkify_by_size_key() -> None:
+    """Should weigh items with the key function."""
+    chunks = chunkify_by_size(range(1, 7), 6, key=int)
+    assert list(chunks) == [([1, 2, 3], 6), ([4], 4), ([5], 5), ([6], 6)]
+
+
+@pytest.mark.parametrize(
+    ("oversize", "expected"),
+    [("isolate", [(["doc"], 3), (["great scott"], 11), (["marty"], 5)]), ("skip", [(["doc"], 3), (["marty"], 5)])],
+)
+def test_chunkify_by_size_oversize(oversize: Any, expected: list[tuple[list[str], int]]) -> None:
+    """Should isolate or skip items that are heavier than the max weight, keeping the input order."""
+    assert list(chunkify_by_size(["doc", "great scott", "marty"], 6, oversize=oversize)) == expected
+
+
+def test_chunkify_by_size_oversize_raise() -> None:
+    """Should raise a ValueError for an item that is heavier than the max weight."""
+    with pytest.raises(ValueError, match="Item 1 weighs 11, more than the max weight of 6"):
+        list(chunkify_by_size(["doc", "great scott"], 6))
+
+
+@suppress_type_checks
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"max_weight": 0}, "Max weight must be > 0, invalid value 0"),
+        ({"max_weight": 1, "max_items": 0}, "Max items must be > 0, invalid value 0"),
+        ({"max_weight": 1, "oversize": "ignore"}, "Oversize must be one of"),
+    ],
+)
+def test_chunkify_by_size_invalid_input(kwargs: dict[str, Any], message: str) -> None:
+    """Should raise a ValueError for invalid limits or oversize policy."""
+    with pytest.raises(ValueError, match=message):
+        chunkify_by_size([], **kwargs)
+
+
+@pytest.mark.parametrize(("func", "arg"), [(chunkify_buffer, b""), (chunkify_file, "marty.txt")])
+def test_chunkify_buffer_invalid_size(func: Any, arg: Any) -> None:
+    """Should raise a ValueError for invalid size."""
+    with pytest.raises(ValueError, match="Size must be > 0, invalid value 0"):
+        func(arg, 0)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_chunked_map(ordered: bool) -> None:
+    """Should apply the function to each chunk and yield one result per chunk."""
+    results = list(chunked_map(sum, range(10), 3, max_in_flight=2, ordered=ordered))
+    assert sorted(results) == [3, 9, 12, 21]
+    if ordered:
+        assert results == [3, 12, 21, 9]
+
+
+def test_chunked_map_executor() -> None:
+    """Should use the given executor without shutting it down."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert list(chunked_map(len, "great scott", 4, executor=executor)) == [4, 4, 3]
+        assert executor.submit(len, "marty").result() == 5
+
+
+def test_chunked_map_lazy() -> None:
+    """Should only pull the input needed for the chunks in flight."""
+    consumed = count()
+    source = (next(consumed) for _ in range(1_000))
+    results = chunked_map(len, source, 10, max_in_flight=2)
+    assert next(results) == 10
+    assert next(consumed) <= 30
+    results.close()
+
+
+def _fail_on_three(chunk: list[int]) -> int:
+    """Sum a chunk, fail on the chunk that contains 3."""
+    if 3 in chunk:
+        raise ValueError("great scott")
+    return sum(chunk)
+
+
+def test_chunked_map_error() -> None:
+    """Should raise the exception of the function with the index of the failed chunk."""
+    with pytest.raises(ValueError, match="great scott") as exc_info:
+        list(chunked_map(_fail_on_three, range(6), 2))
+    assert exc_info.value.__notes__ == ["Raised while processing chunk 1."]
+
+
+@pytest.mark.parametrize(("size", "max_in_flight"), [(0, None), (1, 0)])
+def test_chunked_map_invalid_input(size: int, max_in_flight: int | None) -> None:
+    """Should raise a ValueError for an invalid size or max in flight."""
+    with pytest.raises(ValueError, match="must be > 0"):
+        chunked_map(len, [], size, max_in_flight=max_in_flight)
+
+
 @pytest.mark.parametrize(
     ("sequence", "depth", "expected"),
     [
@@ -55,6 +274,31 @@ def test_flatten(sequence: Iterable[Any] | set[Any], depth: int | None, expected
     assert list(flatten(sequence, depth)) == expected
 
 
+@pytest.mark.parametrize(
+    ("sequence", "depth", "expected"),
+    [
+        (b"abc", None, [b"abc"]),
+        ([b"ab", [bytearray(b"cd")]], None, [b"ab", bytearray(b"cd")]),
+        ([(1, frozenset([2])), range(3, 5), (i for i in [5, [6]])], None, [1, 2, 3, 4, 5, 6]),
+        ([(1, frozenset([2])), range(3, 5), (i for i in [5, [6]])], 1, [1, frozenset([2]), 3, 4, 5, [6]]),
+        ([{"a": 1}, [[], [[]]]], None, ["a"]),
+    ],
+)
+def test_flatten_types(sequence: Iterable[Any], depth: int | None, expected: list[Any]) -> None:
+    """Should flatten any iterable, except strings and bytes."""
+    assert list(flatten(sequence, depth)) == expected
+
+
+@pytest.mark.parametrize(("depth", "expected"), [(None, [0, 1, 2]), (3000, [0, 1, [2]])])
+def test_flatten_deep(depth: int | None, expected: list[Any]) -> None:
+    """Should flatten nesting deeper than the recursion limit."""
+    sequence: list[Any] = [2]
+    for _ in range(2999):
+        sequence = [sequence]
+    sequence = [0, [1, sequence]]
+    assert list(flatten(sequence, depth)) == expected
+
+
 def test_flatten_invalid_depth() -> None:
     """Should raise a ValueError for invalid depth."""
     with pytest.raises(ValueError, match="Depth must be >= 0, invalid value -1"):
@@ -68,6 +312,95 @@ def test_flatten_invalid_type() -> None:
         list(flatten(1, 1))  # type: ignore[arg-type]
 
 
+async def _arange(n: int, delay: float = 0) -> AsyncIterator[int]:
+    """Yield the numbers up to n, with a delay before each of them."""
+    for i in range(n):
+        await asyncio.sleep(delay)
+        yield i
+
+
+async def _acollect(aiterable: AsyncIterable[Any]) -> list[Any]:
+    """Collect an async iterable in a list."""
+    return [item async for item in aiterable]
+
+
+@pytest.mark.parametrize(("size", "expected"), [(2, [[0, 1], [2, 3], [4]]), (5, [[0, 1, 2, 3, 4]])])
+def test_achunkify(size: int, expected: list[list[int]]) -> None:
+    """Should break an async iterable into chunks of the given size."""
+    assert asyncio.run(_acollect(achunkify(_arange(5), size))) == expected
+    assert asyncio.run(_acollect(achunkify(_arange(5), size, max_wait=10))) == expected
+
+
+def test_achunkify_max_wait() -> None:
+    """Should yield a partial chunk when the maximum wait has passed, without losing items."""
+
+    async def source() -> AsyncIterator[int]:
+        yield 1
+        yield 2
+        await asyncio.sleep(0.2)
+        yield 3
+
+    assert asyncio.run(_acollect(achunkify(source(), 10, max_wait=0.05))) == [[1, 2], [3]]
+
+
+def test_achunkify_cancel() -> None:
+    """Should cancel the pending read from the source when the consumer stops."""
+    finalized = []
+
+    async def source() -> AsyncIterator[int]:
+        try:
+            yield 1
+            await asyncio.Event().wait()
+            yield 2
+        finally:
+            finalized.append(True)
+
+    async def consume() -> list[int]:
+        chunks = achunkify(source(), 10, max_wait=0.01)
+        chunk = await anext(chunks)
+        await chunks.aclose()
+        return chunk
+
+    assert asyncio.run(consume()) == [1]
+    assert finalized == [True]
+
+
+@pytest.mark.parametrize(("size", "max_wait"), [(0, None), (1, 0)])
+def test_achunkify_invalid_input(size: int, max_wait: float | None) -> None:
+    """Should raise a ValueError for an invalid size or max wait."""
+    with pytest.raises(ValueError, match="must be > 0"):
+        achunkify(_arange(1), size, max_wait=max_wait)
+
+
+async def _anested() -> AsyncIterator[Any]:
+    """Yield a mix of async iterables, iterables and scalars."""
+    yield 1
+    await asyncio.sleep(0)
+    yield _arange(2)
+    yield [2, [3, "great scott"]]
+
+
+@pytest.mark.parametrize(
+    ("depth", "expected"), [(None, [1, 0, 1, 2, 3, "great scott"]), (1, [1, 0, 1, 2, [3, "great scott"]])]
+)
+def test_aflatten(depth: int | None, expected: list[Any]) -> None:
+    """Should flatten nested async iterables and iterables up to the given depth."""
+    assert asyncio.run(_acollect(aflatten(_anested(), depth))) == expected
+
+
+def test_aflatten_invalid_depth() -> None:
+    """Should raise a ValueError for a negative depth."""
+    with pytest.raises(ValueError, match="Depth must be >= 0, invalid value -1"):
+        aflatten(_arange(1), -1)
+
+
+@suppress_type_checks
+def test_aflatten_invalid_type() -> None:
+    """Should raise a TypeError for a synchronous iterable."""
+    with pytest.raises(TypeError, match="Input must be an async iterable"):
+        aflatten([1, 2])  # type: ignore[invalid-argument-type]
+
+
 @pytest.mark.parametrize(
     ("dicts", "expected"),
     [
@@ -83,6 +416,47 @@ def test_deep_merge(dicts: list[dict[Any, Any]], expected: dict[Any, Any]) -> No
     assert deep_merge(*dicts) == expected
 
 
+def test_deep_merge_layers() -> None:
+    """Should merge many layers, later layers take precedence."""
+    layers = [{"a": {"b": {f"c{i}": i}, "d": i}} for i in range(20)]
+    layers.insert(10, {"a": {"b": 1}})
+    assert deep_merge(*layers) == {"a": {"b": {f"c{i}": i for i in range(10, 20)}, "d": 19}}
+    assert deep_merge() == {}
+    assert list(deep_merge({"a": 1, "b": 2}, {"c": 3, "a": 4})) == ["a", "b", "c"]
+
+
+def test_deep_merge_structural_sharing() -> None:
+    """Should reuse subtrees that only one input contributes."""
+    first = {"a": {"b": 1}, "c": {"d": [1]}}
+    second = {"a": {"e": 2}, "f": {"g": 3}}
+    result = deep_merge(first, second)
+    assert result == {"a": {"b": 1, "e": 2}, "c": {"d": [1]}, "f": {"g": 3}}
+    assert result["c"] is first["c"]
+    assert result["f"] is second["f"]
+    assert result["a"] is not first["a"]
+    assert first == {"a": {"b": 1}, "c": {"d": [1]}}
+
+
+def test_deep_merge_copy() -> None:
+    """Should share nothing with the inputs."""
+    first = {"a": {"b": [1]}, "c": [2]}
+    result = deep_merge(first, {"d": 3}, copy=True)
+    assert result == {"a": {"b": [1]}, "c": [2], "d": 3}
+    assert result["a"] is not first["a"]
+    assert result["a"]["b"] is not first["a"]["b"]
+    assert result["c"] is not first["c"]
+
+
+def test_deep_merge_into() -> None:
+    """Should merge into the target dictionary in place."""
+    nested = {"b": 1, "c": 2}
+    target = {"a": nested, "d": {"e": 1}, "f": 1}
+    result = deep_merge({"a": {"b": 3}}, {"a": {"g": 4}, "d": 5}, into=target)
+    assert result is target
+    assert target == {"a": {"b": 3, "c": 2, "g": 4}, "d": 5, "f": 1}
+    assert target["a"] is nested
+
+
 @suppress_type_checks
 @pytest.mark.parametrize(
     "invalid_input",
@@ -95,3 +469,206 @@ def test_deep_merge_invalid_input(invalid_input: list[Any]) -> None:
     """Should raise a TypeError for invalid input."""
     with pytest.raises(TypeError, match=r"All inputs must be dictionaries."):
         deep_merge(*invalid_input)
+
+
+@suppress_type_checks
+def test_deep_merge_invalid_into() -> None:
+    """Should raise a TypeError for an invalid target."""
+    with pytest.raises(TypeError, match=r"All inputs must be dictionaries."):
+        deep_merge({"a": 1}, into=[])  # type: ignore[arg-type]
+
+
+LAYERS: list[dict[Any, Any]] = [
+    {"db": {"host": "localhost", "port": 5432, "options": {"ssl": False}}, "debug": False, "name": "marty"},
+    {"db": {"options": {"ssl": True, "timeout": 10}}, "debug": True},
+    {"db": {"host": "hill-valley"}, "name": None},
+]
+
+
+def test_deep_chain_map() -> None:
+    """Should resolve keys like a deep merge of the layers."""
+    view = DeepChainMap(*LAYERS)
+    assert view["debug"] is True
+    assert view["name"] is None
+    assert view["db"]["host"] == "hill-valley"
+    assert view["db"]["port"] == 5432
+    assert view["db"]["options"]["ssl"] is True
+    assert view["db"] is view["db"]
+    assert "db" in view
+    assert "missing" not in view
+    assert view.get("missing") is None
+    assert list(view) == ["db", "debug", "name"]
+    assert list(view["db"]) == ["host", "port", "options"]
+    assert len(view) == 3
+    with pytest.raises(KeyError, match="missing"):
+        view["missing"]
+
+
+def test_deep_chain_map_materialize() -> None:
+    """Should materialize to the same result as deep_merge."""
+    view = DeepChainMap(*LAYERS)
+    assert view.materialize() == deep_merge(*LAYERS)
+    assert view == deep_merge(*LAYERS)
+    assert DeepChainMap().materialize() == {}
+
+
+@pytest.mark.parametrize(
+    ("layers", "expected"),
+    [
+        ([{"a": {"b": 1}}, {"a": 2}], 2),
+        ([{"a": 1}, {"a": {"b": 2}}], {"b": 2}),
+        ([{"a": {"b": 1}}, {"a": 2}, {"a": {"c": 3}}], {"c": 3}),
+    ],
+)
+def test_deep_chain_map_override(layers: list[dict[Any, Any]], expected: Any) -> None:
+    """Should only layer the dictionaries above the last value that is not a dictionary."""
+    assert DeepChainMap(*layers)["a"] == expected
+
+
+@suppress_type_checks
+def test_deep_chain_map_invalid_input() -> None:
+    """Should raise a TypeError for invalid input."""
+    with pytest.raises(TypeError, match=r"All inputs must be dictionaries."):
+        DeepChainMap({"a": 1}, [2])  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("nested", "sep", "expected"),
+    [
+        ({"a": {"b": {"c": 1}, "d": [2]}, "e": 3}, ".", {"a.b.c": 1, "a.d": [2], "e": 3}),
+        ({"a": {"b": 1}, "c": {}}, "/", {"a/b": 1, "c": {}}),
+        ({}, ".", {}),
+        ({"": 1, "a": {"": 2}, "b": {"": {"c": 3}}}, ".", {"": 1, "a.": 2, "b..c": 3}),
+    ],
+)
+def test_flatten_dict(nested: dict[str, Any], sep: str, expected: dict[str, Any]) -> None:
+    """Should flatten nested dictionaries and restore them with unflatten_dict."""
+    assert flatten_dict(nested, sep) == expected
+    assert unflatten_dict(expected, sep) == nested
+
+
+def test_flatten_dict_deep() -> None:
+    """Should flatten dictionaries nested deeper than the recursion limit."""
+    nested: dict[str, Any] = {}
+    inner = nested
+    for _ in range(5000):
+        inner["a"] = inner = {}
+    inner["b"] = 1
+    (key,) = flatten_dict(nested)
+    assert key.count(".") == 5000
+
+
+@pytest.mark.parametrize(
+    "flat", [{"a": 1, "a.b": 2}, {"a.b": 2, "a": 1}, {"a": {"x": 1}, "a.b": 2}, {"a.b": 2, "a": {"x": 1}}]
+)
+def test_unflatten_dict_conflict(flat: dict[str, Any]) -> None:
+    """Should raise a ValueError for keys that are both a value and a nested dictionary, without touching the input."""
+    values = [dict(value) if isinstance(value, dict) else value for value in flat.values()]
+    with pytest.raises(ValueError, match="conflicts with"):
+        unflatten_dict(flat)
+    assert list(flat.values()) == values
+
+
+@pytest.mark.parametrize("func", [flatten_dict, unflatten_dict])
+def test_flatten_dict_empty_separator(func: Any) -> None:
+    """Should raise a ValueError for an empty separator."""
+    with pytest.raises(ValueError, match="Separator must not be empty"):
+        func({"a": 1}, "")
+
+
+@suppress_type_checks
+@pytest.mark.parametrize("func", [flatten_dict, unflatten_dict])
+def test_flatten_dict_invalid_type(func: Any) -> None:
+    """Should raise a TypeError for input that is not a dictionary."""
+    with pytest.raises(TypeError, match="Input must be a dictionary"):
+        func([("a", 1)])
+
+
+def test_compile_path() -> None:
+    """Should get and set values in nested dictionaries, and cache the compiled path."""
+    path = compile_path("a.b.c")
+    assert path is compile_path("a.b.c")
+    assert path.keys == ("a", "b", "c")
+    record: dict[str, Any] = {"a": {"x": 1}}
+    assert path.get(record) is None
+    assert path.get(record, "missing") == "missing"
+    path.set(record, "great scott")
+    assert record == {"a": {"x": 1, "b": {"c": "great scott"}}}
+    assert path.get(record) == "great scott"
+    assert compile_path("a/x", sep="/").get(record) == 1
+
+
+def test_compile_path_blocked() -> None:
+    """Should raise a TypeError when setting a path through a value that is not a dictionary."""
+    path = compile_path("a.b.c")
+    assert path.get({"a": {"b": 1}}) is None
+    with pytest.raises(TypeError, match=r"Path 'a\.b\.c' is blocked by a value that is not a dictionary at 'b'"):
+        path.set({"a": {"b": 1}}, 2)
+
+
+@pytest.mark.parametrize(("path", "sep"), [("", "."), ("a.b", "")])
+def test_compile_path_invalid_input(path: str, sep: str) -> None:
+    """Should raise a ValueError for an empty path or separator."""
+    with pytest.raises(ValueError, match="must not be empty"):
+        compile_path(path, sep)
+
+
+def test_unique() -> None:
+    """Should drop duplicates of unhashable items, keeping the first occurrence in input order."""
+    events = [{"id": 1}, [1, 2], {"id": 1}, "doc", [1, 2], {"id": 2}, "doc"]
+    assert list(unique(events)) == [{"id": 1}, [1, 2], "doc", {"id": 2}]
+    # Strings and other objects with the same encoded bytes are distinct
+    assert list(unique(["N", None, "T", True, "N", None])) == ["N", None, "T", True]
+
+
+def test_unique_key() -> None:
+    """Should compare the result of the key function."""
+    events = [{"id": 1, "at": 1985}, {"id": 2, "at": 1955}, {"id": 1, "at": 2015}]
+    assert list(unique(events, key=itemgetter("id"), alg="md5")) == events[:2]
+
+
+@pytest.mark.parametrize(("alg", "digest_size"), [("shake_128", 8), ("sha256", 16), ("blake2s", None)])
+def test_unique_digest_size(alg: str, digest_size: int | None) -> None:
+    """Should deduplicate with any algorithm and digest size."""
+    assert list(unique([[1], [2], [1]], alg=alg, digest_size=digest_size)) == [[1], [2]]
+
+
+def test_unique_window() -> None:
+    """Should forget the oldest distinct items beyond the window."""
+    assert list(unique([1, 2, 1, 3, 1, 3], window=2)) == [1, 2, 3, 1]
+
+
+def test_unique_bloom_filter() -> None:
+    """Should always drop duplicates and rarely drop distinct items with a Bloom filter."""
+    items = list(range(10_000))
+    distinct = list(unique(items + items, false_positive_rate=0.01, capacity=10_000))
+    assert len(distinct) == len(set(distinct))
+    assert len(distinct) > 9_800
+
+
+@pytest.mark.parametrize(("alg", "digest_size"), [("blake2b", 16), ("blake2s", 32), ("md5", None), ("sha1", None)])
+def test_unique_bloom_filter_digest_size(alg: str, digest_size: int | None) -> None:
+    """Should keep the false positive rate with every digest of at least 16 bytes."""
+    items = list(range(10_000))
+    distinct = list(unique(items, alg=alg, digest_size=digest_size, false_positive_rate=0.01, capacity=10_000))
+    assert len(distinct) > 9_800
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"window": 2, "false_positive_rate": 0.1}, "Use either a window or a false positive rate, not both"),
+        ({"window": 0}, "Window must be > 0, invalid value 0"),
+        ({"false_positive_rate": 1.0}, "False positive rate must be between 0 and 1, invalid value 1.0"),
+        ({"false_positive_rate": 0.1, "capacity": 0}, "Capacity must be > 0, invalid value 0"),
+        ({"alg": "jigowatt"}, "Hashing algorithm 'jigowatt' not supported"),
+        (
+            {"false_positive_rate": 0.1, "digest_size": 8},
+            "A false positive rate needs digests of at least 16 bytes, invalid digest size 8",
+        ),
+    ],
+)
+def test_unique_invalid_input(kwargs: dict[str, Any], message: str) -> None:
+    """Should raise a ValueError for invalid options."""
+    with pytest.raises(ValueError, match=message):
+        unique([], **kwargs)
@@ -1,12 +1,34 @@
 """Tests hashify function."""
 
+import gc
+import hashlib
+import io
+import os
+import subprocess  # noqa: S404
+import sys
+import weakref
+from collections.abc import Generator
+from dataclasses import dataclass, field
 from decimal import Decimal
 from itertools import product
+from pathlib import Path
 from typing import Any
 
 import pytest
+from pytest_mock import MockerFixture
+from typeguard import suppress_type_checks
 
-from orval.hashing import hashify
+from orval import CacheInfo
+from orval.hashing import (
+    hashify,
+    hashify_cache_clear,
+    hashify_cache_info,
+    hashify_cache_invalidate,
+    hashify_file,
+    hashify_files,
+    hashify_many,
+    set_hashify_cache_size,
+)
 
 GUARANTEED_ALGORITHMS = {
     "sha3_256": 64,
@@ -60,13 +82,13 @@ def test___unsupported_algorithm__fairure() -> None:
         (
             "md5",
             [],
-            "d34b2ff3ebd47dff1d21eee2d69d4ffd",
+            "7b05885c9fe756d02c88274d7e939084",
         ),
         ("sha256", "scott", "12a303c224c250d07c81691de6e0fd74699ce6bd78c234057de70413a58457cf"),
-        ("sha256", 1, "4d672a9db795f0105d536626cd190c28ed199cc8d145e2349e5457f7ff6f38be"),
-        ("sha256", set(), "0cdaff94fb5e168a49c2a0b2807ed3972fce8e480f1250e43ec781d150f077ec"),
-        ("sha256", object(), "73f109a46d7d1ba94c6ce0997ab29937fcc86e2ec93468b76c7ac8cfa0919638"),
-        ("sha256", None, "4f3fc348a818941a464e415fff6b9d416c1ddc3b1c64743861d328fbc345bcd6"),
+        ("sha256", 1, "e198efaf9f87365ec1ce84925fe58a52ef9a27b171f6022284aa01e8fad42a9a"),
+        ("sha256", set(), "7ed803458814a75fdbb22c9a5eeb582ddb64e98bdadb7ab79f7d06b3c438e092"),
+        ("sha256", object(), "ccb30e166a0afee8314be042c49c0cbdff5bec7bc357bd9a9ac293b1e27a7234"),
+        ("sha256", None, "acfb86c3ddb00d436dac15d705dd8aa7304219ef42b8788ed24d43a0f9a383c7"),
         (
             "sha512",
             "jigowatt",
@@ -75,7 +97,7 @@ def test___unsupported_algorithm__fairure() -> None:
         (
             "sha512",
             {},
-            "06d4f7503aef23b72dc00355f83eb77d9ff0fee3216251c91b63aa071cc3d234ed0d76d527a277cf9a51a77fa946a08ddfde02de8cd12e6e1362330d1e1dca3e",
+            "2b277adeec4046203d0d84e01dbe519fa99f8448263d8b12765981035716124db16c87fbba734248ef558f7386611f6349ff9c89c67b00d524a1cebbfb383d84",
         ),
     ],
 )
@@ -87,3 +109,463 @@ def test__sanity_checks__success(alg: str, obj: Any, expected: str) -> None:
     Is there a better approach to do sanity checks without listing a huge table of parameterized values?
     """
     assert hashify(obj, alg=alg) == expected, f"{alg}={type(obj)}"
+
+
+@pytest.mark.parametrize(
+    ("obj_1", "obj_2"),
+    [
+        ({"a": 1, "b": [2, 3]}, {"b": [2, 3], "a": 1}),
+        ({"great", "scott", 1985}, {1985, "scott", "great"}),
+        ([{"x": {1, 2}}, frozenset({"y"})], [{"x": {2, 1}}, frozenset({"y"})]),
+    ],
+)
+def test__order_independent__success(obj_1: Any, obj_2: Any) -> None:
+    """Should return the same hash for dictionaries and sets regardless of their order."""
+    assert hashify(obj_1) == hashify(obj_2)
+
+
+def test__type_tagged__success() -> None:
+    """Should return different hashes for equal values of different types and for differently nested values."""
+    values = [1, 1.0, True, "1", b"1", [1], (1,), {1}, frozenset({1}), {1: 1}, [[1]], ["1", "2"], ["12"], [], None]
+    assert len({hashify(value) for value in values}) == len(values)
+    # Strings are hashed as their UTF-8 encoding, which never matches the encoding of another object
+    pairs = [("N", None), ("T", True), ("F", False), ("q\x00\x00\x00\x00\x00\x00\x00\x05", 5), ("x", b"x")]
+    for string, obj in pairs:
+        assert hashify(string) == hashlib.sha256(string.encode()).hexdigest()
+        assert hashify(string) != hashify(obj)
+
+
+def test__streaming__success() -> None:
+    """Should hash large and deeply nested objects, values larger than a chunk are passed on unbuffered."""
+    big = "x" * 200_000
+    assert hashify([big, big.encode(), 2**100]) == hashify([big, big.encode(), 2**100])
+    nested: list[Any] = []
+    inner = nested
+    for _ in range(5000):
+        inner.append([])
+        inner = inner[0]
+    assert len(hashify(nested)) == 64
+
+
+def test__fallback__success() -> None:
+    """Should fall back to pickle for other types, including as dictionary keys."""
+    assert hashify(Decimal("1.1")) == hashify(Decimal("1.1"))
+    assert hashify({Decimal("1.1"): (1, 2)}) != hashify({Decimal("1.2"): (1, 2)})
+
+
+def _recursive(value: Any) -> list[Any]:
+    """Build a list that contains itself, through a dictionary."""
+    obj: list[Any] = [value]
+    obj.append({"self": obj})
+    return obj
+
+
+def test__recursive__success() -> None:
+    """Should hash an object that contains itself by referring back to it."""
+    assert hashify(_recursive(1)) == hashify(_recursive(1))
+    assert hashify(_recursive(1)) != hashify(_recursive(2))
+    assert hashify(_recursive(1)) != hashify([1, {"self": [1]}])
+    obj: dict[str, Any] = {"a": 1}
+    obj["self"] = obj
+    reordered: dict[str, Any] = {}
+    reordered["self"] = reordered
+    reordered["a"] = 1
+    assert hashify(obj) == hashify(reordered)
+
+
+def test__plain__success() -> None:
+    """Should return the same hash for plain data regardless of key order, segments or shared objects."""
+    records: list[Any] = [{"id": i, "name": f"user {i}", "tags": [i, None]} for i in range(3000)]
+    reordered: list[Any] = [dict(reversed(record.items())) for record in records]
+    assert hashify(records) == hashify(reordered)
+    # A value that isn't plain only changes how its segment is encoded
+    records[1500]["id"] = reordered[1500]["id"] = Decimal("1.21")
+    assert hashify(records) == hashify(reordered)
+    assert hashify(records) != hashify(reordered[:-1])
+    names = [f"great scott {year}" for year in (1985, 1985)]
+    assert names[0] is not names[1]
+    assert hashify([names[0], names[0]]) == hashify(names)
+
+
+@pytest.mark.parametrize("key", [True, 1.0])
+def test__plain_key_types__success(key: Any) -> None:
+    """Should not mistake the keys of a dictionary for equal keys of another type in a previous dictionary."""
+    value = [[0]]
+    assert hashify([{1: value}, {key: value}]) != hashify([{1: value}, {1: value}])
+    assert hashify({"a": {1: value}, "b": {key: value}}) != hashify({"a": {1: value}, "b": {1: value}})
+
+
+def test__stable_across_processes__success() -> None:
+    """Should return the same hash for sets of strings regardless of hash randomization."""
+    code = "from orval import hashify; print(hashify({'great', 'scott', 'marty', 'doc'}))"
+    digests = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert digests == {hashify({"great", "scott", "marty", "doc"}) + "\n"}
+
+
+PLAIN = {
+    "ints": [0, 1, 255, 256, 65535, 65536, -1, 2**31 - 1, -(2**31), 2**31, 2**63 - 1, -(2**63), 2**64, -(2**100)],
+    "floats": [0.0, -0.0, 1.21, float("inf"), 1e-300],
+    "strings": ["", "great scott", "\u00e9", "\N{SNOWMAN}", "\ud800", "x" * 255, "x" * 256, "x" * 70_000],
+    "bytes": [b"", b"\x00", b"y" * 255, b"y" * 256],
+    "constants": [None, True, False],
+    "tuples": [(), (1,), (1, 2), (1, 2, 3), (1, 2, 3, 4)],
+    "lists": [[], [1], list(range(1001)), [[[]]]],
+    "dicts": [{}, {"doc": 1}, {i: -i for i in range(1001)}, {b"car": {"year": [1985]}}],
+}
+
+
+@pytest.mark.parametrize(
+    ("obj", "expected"),
+    [
+        (PLAIN, "469d6dbcd30f0d9e017166b997643a5f029094809ecf04c25a8697d4e9c154cd"),
+        (
+            [{"id": i, "name": f"user {i}", "tags": (i, None)} for i in range(2500)],
+            "1f1d00cabb9da8b384d74d2af5a8d72f6ca16ba745f7a9057371fe2813bab674",
+        ),
+        (
+            [{"id": 1, "tags": {"a"}}, frozenset({b"b"}), ("doc", [1.21])],
+            "2fabbb131533789d8114c9b851410470ffd693c8c664388d50a03ea0266ad928",
+        ),
+    ],
+)
+def test__pinned_digests__success(obj: Any, expected: str) -> None:
+    """Should return the same hash for nested plain data in every Python version.
+
+    Plain data is pickled at once, so this fails if pickle changes how it writes builtin types.
+    """
+    assert hashify(obj) == expected
+
+
+CONTENT = b"great scott" * 10_000
+
+
+class _ReadOnly:
+    """File-like object that only has a read method."""
+
+    def __init__(self, data: bytes) -> None:
+        self._stream = io.BytesIO(data)
+
+    def read(self, size: int) -> bytes:
+        return self._stream.read(size)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 4096, 1024 * 1024])
+def test__hashify_file__success(tmp_path: Path, chunk_size: int) -> None:
+    """Should return the hash of the content of a file per algorithm, for paths and file objects."""
+    path = tmp_path / "delorean.bin"
+    path.write_bytes(CONTENT)
+    expected = {"sha256": hashlib.sha256(CONTENT).hexdigest(), "md5": hashlib.md5(CONTENT).hexdigest()}  # noqa: S324
+    assert hashify_file(path, algs=("sha256", "md5"), chunk_size=chunk_size) == expected
+    assert hashify_file(str(path), algs=["sha256", "md5", "sha256"], chunk_size=chunk_size) == expected
+    with path.open("rb") as fileobj:
+        assert hashify_file(fileobj, algs=("sha256", "md5"), chunk_size=chunk_size) == expected
+
+
+def test__hashify_file_bytes_io__success() -> None:
+    """Should read in-memory binary streams."""
+    assert hashify_file(io.BytesIO(CONTENT)) == {"sha256": hashlib.sha256(CONTENT).hexdigest()}
+
+
+@suppress_type_checks
+def test__hashify_file_read_only__success() -> None:
+    """Should read minimal file-like objects that only have a read method."""
+    assert hashify_file(_ReadOnly(CONTENT)) == {"sha256": hashlib.sha256(CONTENT).hexdigest()}  # type: ignore[invalid-argument-type]
+
+
+def test__hashify_file_shake__success() -> None:
+    """Should return a digest of 64 bytes for variable length algorithms, like hashify."""
+    assert len(hashify_file(io.BytesIO(b""), algs=("shake_128",))["shake_128"]) == 128
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"algs": ()}, "At least one hashing algorithm is required"),
+        ({"algs": ("sha256", "jigowatt")}, "Hashing algorithm 'jigowatt' not supported"),
+        ({"chunk_size": 0}, "Chunk size must be > 0, invalid value 0"),
+    ],
+)
+def test__hashify_file_invalid_input__failure(kwargs: dict[str, Any], message: str) -> None:
+    """Should raise a ValueError for invalid algorithms or chunk size."""
+    with pytest.raises(ValueError, match=message):
+        hashify_file(io.BytesIO(CONTENT), **kwargs)
+
+
+@suppress_type_checks
+def test__hashify_file_text_mode__failure() -> None:
+    """Should raise a TypeError for a file opened in text mode."""
+    with pytest.raises(TypeError, match="File must be opened in binary mode"):
+        hashify_file(io.StringIO("great scott"))  # type: ignore[invalid-argument-type]
+
+
+@pytest.mark.parametrize(("workers", "max_in_flight_bytes"), [(None, 256 * 1024 * 1024), (2, 10), (1, 1)])
+def test__hashify_many__success(workers: int | None, max_in_flight_bytes: int) -> None:
+    """Should return the hash of every item with its index, within any memory budget."""
+    items: list[Any] = [b"x" * 100, "great scott", {"doc": "brown"}, b"y" * 1000, None]
+    results = dict(hashify_many(items, alg="md5", workers=workers, max_in_flight_bytes=max_in_flight_bytes))
+    assert results == {index: hashify(item, alg="md5") for index, item in enumerate(items)}
+
+
+def test__hashify_many_largest_first__success() -> None:
+    """Should start the largest items first."""
+    items = [b"x", b"x" * 1000, b"x" * 10]
+    assert [index for index, _ in hashify_many(items, workers=1, max_in_flight_bytes=1)] == [1, 2, 0]
+
+
+def test__hashify_many_error__failure(mocker: MockerFixture) -> None:
+    """Should raise the exception of a failed item with its index."""
+    mocker.patch("orval.hashing.hashify", side_effect=ValueError("great scott"))
+    with pytest.raises(ValueError, match="great scott") as exc_info:
+        list(hashify_many(["doc"]))
+    assert exc_info.value.__notes__ == ["Raised while hashing 0."]
+
+
+@pytest.mark.parametrize("max_in_flight_bytes", [256 * 1024 * 1024, 1])
+def test__hashify_files__success(tmp_path: Path, max_in_flight_bytes: int) -> None:
+    """Should return the hashes of every file with its path, largest first when run one at a time."""
+    paths = []
+    for size in (10, 0, 10_000):
+        path = tmp_path / f"{size}.bin"
+        path.write_bytes(b"x" * size)
+        paths.append(path)
+    results = list(
+        hashify_files(
+            paths, algs=("sha256", "md5"), workers=1, chunk_size=4096, max_in_flight_bytes=max_in_flight_bytes
+        )
+    )
+    if max_in_flight_bytes == 1:
+        # One file in flight at a time, so completion order is submission order.
+        assert [path for path, _ in results] == [paths[2], paths[0], paths[1]]
+    assert dict(results) == {path: hashify_file(path, algs=("sha256", "md5")) for path in paths}
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"workers": 0}, "Workers must be > 0, invalid value 0"),
+        ({"max_in_flight_bytes": 0}, "Max in flight bytes must be > 0, invalid value 0"),
+        ({"alg": "jigowatt"}, "Hashing algorithm 'jigowatt' not supported"),
+    ],
+)
+def test__hashify_many_invalid_input__failure(kwargs: dict[str, Any], message: str) -> None:
+    """Should raise a ValueError for invalid options before hashing."""
+    with pytest.raises(ValueError, match=message):
+        hashify_many([], **kwargs)
+
+
+@pytest.mark.parametrize("obj", ["great scott", {"doc": ["brown", 1985]}])
+def test__output__success(obj: Any) -> None:
+    """Should return the same hash as raw bytes or an integer."""
+    hexdigest = hashify(obj)
+    assert hashify(obj, output="hex") == hexdigest
+    assert hashify(obj, output="bytes") == bytes.fromhex(hexdigest)
+    assert hashify(obj, output="int") == int(hexdigest, 16)
+
+
+@pytest.mark.parametrize(
+    ("alg", "digest_size", "length"),
+    [("blake2b", 16, 32), ("blake2b", 64, 128), ("blake2s", 8, 16), ("shake_128", 16, 32), ("shake_256", 100, 200)],
+)
+def test__digest_size__success(alg: str, digest_size: int, length: int) -> None:
+    """Should return a hash of the given size for algorithms with a variable size."""
+    assert len(hashify("great scott", alg=alg, digest_size=digest_size)) == length
+    assert hashify([1, 2], alg=alg, digest_size=digest_size) == hashify([1, 2], alg=alg, digest_size=digest_size)
+
+
+def test__digest_size_default__success() -> None:
+    """Should return a different hash for a different digest size, and the default size of blake2b."""
+    assert hashify("great scott", alg="blake2b", digest_size=64) == hashify("great scott", alg="blake2b")
+    assert hashify("great scott", alg="blake2b", digest_size=32) != hashify("great scott", alg="blake2b")[:64]
+
+
+@pytest.mark.parametrize("alg", ["shake_128", "shake_256"])
+def test__digest_size_shake__success(alg: str) -> None:
+    """Should return the same stream for every length of a shake hash, and validate every length."""
+    digests = [hashify([1, 2], alg=alg, digest_size=size) for size in range(1, 50)]
+    assert all(digest == digests[-1][: len(digest)] for digest in digests)
+    with pytest.raises(ValueError, match="Digest size must be > 0, invalid value 0"):
+        hashify([1, 2], alg=alg, digest_size=0)
+
+
+@suppress_type_checks
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"alg": "sha256", "digest_size": 16}, "Digest size is only supported by blake2b, blake2s, shake_128 and"),
+        ({"alg": "blake2b", "digest_size": 65}, "Digest size must be between 1 and 64 for blake2b, invalid value 65"),
+        ({"alg": "blake2s", "digest_size": 0}, "Digest size must be between 1 and 32 for blake2s, invalid value 0"),
+        ({"alg": "shake_128", "digest_size": 0}, "Digest size must be > 0, invalid value 0"),
+        ({"output": "base64"}, "Output must be one of"),
+    ],
+)
+def test__output_invalid_input__failure(kwargs: dict[str, Any], message: str) -> None:
+    """Should raise a ValueError for an invalid digest size or output."""
+    with pytest.raises(ValueError, match=message):
+        hashify("great scott", **kwargs)
+
+
+@pytest.fixture
+def hashify_cache() -> Generator[None]:
+    """Start with an empty hashify cache and restore its size afterwards."""
+    maxsize = hashify_cache_info().maxsize
+    hashify_cache_clear()
+    yield
+    set_hashify_cache_size(maxsize)
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Frozen configuration snapshot."""
+
+    name: str
+    values: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class _SlottedSnapshot:
+    """Frozen configuration snapshot with slots."""
+
+    name: str
+    version: complex = 0j
+
+
+@dataclass(frozen=True)
+class _MutableSnapshot:
+    """Frozen dataclass with a mutable field."""
+
+    values: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _TaggedSnapshot:
+    """Frozen dataclass with a mutable field that isn't compared, so it is hashable."""
+
+    name: str
+    tags: list[str] = field(default_factory=list, compare=False)
+
+
+class _Flux:
+    """Mutable object that hashes by identity."""
+
+    def __init__(self) -> None:
+        self.gigawatts = 1.21
+
+
+@pytest.mark.usefixtures("hashify_cache")
+@pytest.mark.parametrize(
+    "obj",
+    [
+        "great scott",
+        b"jigowatt",
+        (1, ("doc", frozenset({2}))),
+        frozenset({"marty"}),
+        _Snapshot("doc", (1,)),
+        _SlottedSnapshot("doc", 1j),
+    ],
+)
+def test__cache__success(obj: Any) -> None:
+    """Should memoize the hash of immutable objects per object, algorithm and digest size."""
+    assert hashify(obj, cache=True) == hashify(obj)
+    assert hashify(obj, cache=True) == hashify(obj)
+    assert hashify(obj, alg="blake2b", digest_size=8, cache=True) == hashify(obj, alg="blake2b", digest_size=8)
+    assert hashify_cache_info()[:2] == (1, 2)
+    assert hashify_cache_info().currsize == 1
+    assert isinstance(hashify_cache_info(), CacheInfo)
+
+
+@pytest.mark.usefixtures("hashify_cache")
+@pytest.mark.parametrize(
+    "obj",
+    [
+        [1, 2],
+        {"doc": "brown"},
+        (1, [2]),
+        _MutableSnapshot([1]),
+        _TaggedSnapshot("doc", ["flux"]),
+        (_Flux(),),
+        (Decimal("1.21"),),
+        1985,
+        None,
+    ],
+)
+def test__cache_mutable__success(obj: Any) -> None:
+    """Should never cache mutable objects, or tuples and dataclasses that contain them or other types."""
+    assert hashify(obj, cache=True) == hashify(obj)
+    assert hashify_cache_info().currsize == 0
+
+
+@pytest.mark.usefixtures("hashify_cache")
+def test__cache_stale__success() -> None:
+    """Should not return a stale hash for hashable objects with mutable contents."""
+    flux = _Flux()
+    capacitor = (flux,)
+    snapshot = _TaggedSnapshot("doc")
+    before = hashify(capacitor, cache=True), hashify(snapshot, cache=True)
+    flux.gigawatts = 2.42
+    snapshot.tags.append("flux")
+    after = hashify(capacitor, cache=True), hashify(snapshot, cache=True)
+    assert after == (hashify(capacitor), hashify(snapshot))
+    assert after[0] != before[0]
+    assert after[1] != before[1]
+
+
+@pytest.mark.usefixtures("hashify_cache")
+def test__cache_weakref__success() -> None:
+    """Should not keep objects alive that support weak references."""
+    snapshot = _Snapshot("doc")
+    hashify(snapshot, cache=True)
+    ref = weakref.ref(snapshot)
+    del snapshot
+    gc.collect()
+    assert ref() is None
+    # A new object that happens to get the same id is not mistaken for the collected one
+    assert hashify(_Snapshot("marty"), cache=True) == hashify(_Snapshot("marty"))
+
+
+@pytest.mark.usefixtures("hashify_cache")
+def test__cache_eviction__success() -> None:
+    """Should evict the least recently used object beyond the maximum size."""
+    set_hashify_cache_size(2)
+    items = [(1,), (2,), (3,)]
+    hashify(items[0], cache=True)
+    hashify(items[1], cache=True)
+    hashify(items[0], cache=True)
+    hashify(items[2], cache=True)
+    assert hashify_cache_info() == (1, 3, 2, 2)
+    assert not hashify_cache_invalidate(items[1])
+    assert hashify_cache_invalidate(items[0])
+    assert not hashify_cache_invalidate(items[0])
+    assert hashify_cache_info().currsize == 1
+
+
+@pytest.mark.usefixtures("hashify_cache")
+def test__cache_disabled__success() -> None:
+    """Should not cache anything with a size of 0."""
+    set_hashify_cache_size(0)
+    assert hashify((1, 2), cache=True) == hashify((1, 2))
+    assert hashify_cache_info() == (0, 0, 0, 0)
+
+
+def test__cache_invalid_size__failure() -> None:
+    """Should raise a ValueError for a negative cache size."""
+    with pytest.raises(ValueError, match="Cache size must be >= 0 or None, invalid value -1"):
+        set_hashify_cache_size(-1)
+
+
+@suppress_type_checks
+@pytest.mark.usefixtures("hashify_cache")
+def test__cache_invalid_output__failure() -> None:
+    """Should raise a ValueError for an invalid output before hashing or caching the object."""
+    with pytest.raises(ValueError, match="Output must be one of"):
+        hashify(("great", "scott"), output="base64", cache=True)  # type: ignore[no-matching-overload]
+    assert hashify_cache_info()[:2] == (0, 0)
+    assert hashify_cache_info().currsize == 0
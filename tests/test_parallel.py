@@ -0,0 +1,54 @@
+"""Tests for the parallel module."""
+
+import multiprocessing
+
+import pytest
+
+from orval import kebab_case, slugify
+from orval.parallel import parallel_map_case
+
+STRINGS = [f"Great Scott {i % 250} Gigawatts!" for i in range(5000)]
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_parallel_map_case(method: str) -> None:
+    """Should convert every string, in input order, with both fork and spawn workers."""
+    context = multiprocessing.get_context(method)
+    results = parallel_map_case("slugify", iter(STRINGS), workers=2, chunk_size=97, mp_context=context)
+    assert list(results) == [slugify(string) for string in STRINGS]
+
+
+def test_parallel_map_case_options() -> None:
+    """Should pass options to the casing function."""
+    results = parallel_map_case("kebab_case", STRINGS[:10], workers=1, chunk_size=3, max_in_flight=1, scream=True)
+    assert list(results) == [kebab_case(string, scream=True) for string in STRINGS[:10]]
+
+
+def test_parallel_map_case_empty() -> None:
+    """Should return nothing for empty input."""
+    assert list(parallel_map_case("snake_case", [], workers=1)) == []
+
+
+def test_parallel_map_case_stop_early() -> None:
+    """Should stop the workers when the consumer stops."""
+    results = parallel_map_case("camel_case", (f"great scott {i}" for i in range(10**9)), workers=2, chunk_size=10)
+    assert next(results) == "greatScott0"
+    results.close()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "error", "match"),
+    [
+        ({"style": "sarcasm_case"}, ValueError, "Style must be one of"),
+        ({"chunk_size": 0}, ValueError, "Chunk size must be > 0, invalid value 0"),
+        ({"workers": 0}, ValueError, "Workers must be > 0, invalid value 0"),
+        ({"workers": -2}, ValueError, "Workers must be > 0, invalid value -2"),
+        ({"max_in_flight": -1}, ValueError, "Max in flight must be > 0, invalid value -1"),
+        ({"great": "scott"}, TypeError, "unexpected keyword argument"),
+    ],
+)
+def test_parallel_map_case_invalid(kwargs: dict[str, object], error: type[Exception], match: str) -> None:
+    """Should raise before starting any worker."""
+    kwargs = {"style": "slugify", **kwargs}
+    with pytest.raises(error, match=match):
+        parallel_map_case(strings=[], **kwargs)  # type: ignore[arg-type]
@@ -1,8 +1,62 @@
 """Tests for the string manipulation functions."""
 
+import random
+import re
+import string as string_module
+import unicodedata
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count
+
 import pytest
 
-from orval import camel_case, dot_case, kebab_case, pascal_case, slugify, snake_case, train_case, truncate
+from orval import (
+    CacheInfo,
+    Casings,
+    SlugRegistry,
+    camel_case,
+    camel_case_many,
+    convert_all,
+    dot_case,
+    dot_case_many,
+    kebab_case,
+    kebab_case_many,
+    normalize_cache_clear,
+    normalize_cache_info,
+    pascal_case,
+    pascal_case_many,
+    set_normalize_cache_size,
+    slugify,
+    slugify_many,
+    snake_case,
+    snake_case_many,
+    train_case,
+    train_case_many,
+    transform_keys,
+    truncate,
+    truncate_bytes,
+)
+
+
+def _reference_kebab_case(string: str, unicode: bool, compact_spaces: bool) -> str:
+    """Kebab-case a string with the original, regex based, normalization pipeline."""
+    form = "NFKC" if unicode else "NFKD"
+    value = unicodedata.normalize(form, string)
+    if not unicode:
+        value = value.encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^\w\s]|_", " ", value)
+    text = re.sub(r"\s+", " ", text).strip() if compact_spaces else text.strip()
+    return text.replace(" ", "-").lower()
+
+
+@pytest.fixture
+def normalize_cache() -> Generator[None]:
+    """Start with an empty normalization cache and restore its size afterwards."""
+    maxsize = normalize_cache_info().maxsize
+    normalize_cache_clear()
+    yield
+    set_normalize_cache_size(maxsize)
 
 
 @pytest.mark.parametrize(
@@ -231,3 +285,357 @@ def test_truncate(string: str, number: int, suffix: str, expected: str | type[Va
             truncate(string, number, suffix)
     else:
         assert truncate(string, number, suffix) == expected
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_normalize_cache_hits() -> None:
+    """Should skip the normalization pipeline for repeated inputs."""
+    assert kebab_case("Great Scott") == "great-scott"
+    assert snake_case("Great Scott") == "great_scott"
+    assert camel_case("Great Scott") == "greatScott"
+    info = normalize_cache_info()
+    assert isinstance(info, CacheInfo)
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+    # A different flag is a different cache key
+    assert slugify("Great Scott") == "great-scott"
+    assert normalize_cache_info().misses == 2
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_normalize_cache_bounded() -> None:
+    """Should never hold more entries than the configured size."""
+    set_normalize_cache_size(2)
+    for string in ("a", "b", "c", "d"):
+        kebab_case(string)
+    info = normalize_cache_info()
+    assert (info.maxsize, info.currsize) == (2, 2)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_normalize_cache_disabled() -> None:
+    """Should not memoize anything when the size is 0."""
+    set_normalize_cache_size(0)
+    assert kebab_case("Great Scott") == kebab_case("Great Scott") == "great-scott"
+    info = normalize_cache_info()
+    assert (info.hits, info.currsize) == (0, 0)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_normalize_cache_thread_safe() -> None:
+    """Should return consistent results when used from multiple threads."""
+    set_normalize_cache_size(8)
+    strings = [f"Great Scott {i % 16}" for i in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(kebab_case, strings))
+    assert results == [f"great-scott-{i % 16}" for i in range(2000)]
+    assert normalize_cache_info().currsize <= 8
+
+
+def test_normalize_cache_invalid_size() -> None:
+    """Should raise a ValueError for a negative cache size."""
+    with pytest.raises(ValueError, match="Cache size must be >= 0 or None, invalid value -1"):
+        set_normalize_cache_size(-1)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+@pytest.mark.parametrize(("unicode", "compact_spaces"), [(True, True), (True, False), (False, True), (False, False)])
+def test_ascii_fast_path(unicode: bool, compact_spaces: bool) -> None:
+    """Should produce exactly the same output as the original pipeline for ASCII input."""
+    set_normalize_cache_size(0)
+    rng = random.Random(1955)  # noqa: S311
+    alphabet = string_module.printable + "".join(chr(i) for i in range(32)) + "_" * 5 + " " * 10
+    corpus = ["".join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(2000)]
+    for string in corpus:
+        assert string.isascii()
+        expected = _reference_kebab_case(string, unicode=unicode, compact_spaces=compact_spaces)
+        assert kebab_case(string, unicode=unicode, compact_spaces=compact_spaces) == expected, repr(string)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+@pytest.mark.parametrize(("unicode", "compact_spaces"), [(True, True), (True, False), (False, True), (False, False)])
+def test_translate_normalizer(unicode: bool, compact_spaces: bool) -> None:
+    """Should produce exactly the same output as the original pipeline for Unicode input."""
+    set_normalize_cache_size(0)
+    rng = random.Random(1985)  # noqa: S311
+    alphabet = "aZ09 _-.!\t\n\x1f\u00a0\u2003\u3000öÖìﬁ①²ß¿€—・世界こんにちは💩🤘\u0301\u200b"
+    corpus = ["".join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(2000)]
+    for string in corpus:
+        expected = _reference_kebab_case(string, unicode=unicode, compact_spaces=compact_spaces)
+        assert kebab_case(string, unicode=unicode, compact_spaces=compact_spaces) == expected, repr(string)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+@pytest.mark.parametrize("unicode", [True, False])
+def test_translate_normalizer_code_points(unicode: bool) -> None:
+    """Should treat every code point like the original pipeline, inside and outside of the Latin-1 range."""
+    set_normalize_cache_size(0)
+    for start in range(0, 0x3100, 64):
+        string = "".join(chr(codepoint) for codepoint in range(start, start + 64) if not 0xD800 <= codepoint <= 0xDFFF)
+        expected = _reference_kebab_case(string, unicode=unicode, compact_spaces=True)
+        assert kebab_case(string, unicode=unicode) == expected, hex(start)
+
+
+BATCH = ["Great Scott", "  great   scott  ", "!!öì 💩", "Hello 世界 W", "", "content type", "Great Scott", "_C"]
+
+
+@pytest.mark.parametrize(
+    ("many", "single"),
+    [
+        (kebab_case_many, kebab_case),
+        (
+            partial(kebab_case_many, scream=True, compact_spaces=False),
+            partial(kebab_case, scream=True, compact_spaces=False),
+        ),
+        (slugify_many, slugify),
+        (camel_case_many, camel_case),
+        (partial(camel_case_many, unicode=False), partial(camel_case, unicode=False)),
+        (pascal_case_many, pascal_case),
+        (train_case_many, train_case),
+        (partial(train_case_many, unicode=True), partial(train_case, unicode=True)),
+        (snake_case_many, snake_case),
+        (partial(snake_case_many, scream=True, unicode=False), partial(snake_case, scream=True, unicode=False)),
+        (dot_case_many, dot_case),
+        (partial(dot_case_many, scream=True), partial(dot_case, scream=True)),
+    ],
+)
+def test_case_many(many: Callable[..., Iterator[str] | list[str]], single: Callable[[str], str]) -> None:
+    """Should convert a batch of strings exactly like the single string functions."""
+    expected = [single(string) for string in BATCH]
+    assert list(many(iter(BATCH))) == expected
+    result = many(BATCH, as_list=True)
+    assert isinstance(result, list)
+    assert result == expected
+
+
+def test_case_many_lazy() -> None:
+    """Should convert strings as they are consumed."""
+    strings: Iterable[str] = (f"Great Scott {i}" for i in count())
+    results = kebab_case_many(strings)
+    assert next(results) == "great-scott-0"
+    assert next(results) == "great-scott-1"
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_case_many_deduplicates() -> None:
+    """Should only convert strings that repeat within a batch once."""
+    set_normalize_cache_size(0)
+    strings = ["Great Scott", "McFly", "Great Scott"] * 100
+    assert snake_case_many(strings, as_list=True) == ["great_scott", "mcfly", "great_scott"] * 100
+    assert normalize_cache_info().misses == 2
+
+
+@pytest.mark.parametrize("string", BATCH)
+@pytest.mark.parametrize("unicode", [True, False])
+def test_convert_all(string: str, unicode: bool) -> None:
+    """Should return the same casings as the individual functions."""
+    casings = convert_all(string, unicode=unicode)
+    assert isinstance(casings, Casings)
+    assert casings.snake == snake_case(string, unicode=unicode)
+    assert casings.kebab == kebab_case(string, unicode=unicode)
+    assert casings.dot == dot_case(string, unicode=unicode)
+    assert casings.camel == camel_case(string, unicode=unicode)
+    assert casings.pascal == pascal_case(string, unicode=unicode)
+    assert casings.train == train_case(string, unicode=unicode)
+
+
+@pytest.mark.usefixtures("normalize_cache")
+def test_convert_all_normalizes_once() -> None:
+    """Should normalize the string once and build each casing only once."""
+    set_normalize_cache_size(0)
+    casings = convert_all("Great Scott")
+    assert casings.pascal is casings.pascal
+    assert (casings.snake, casings.camel, casings.train) == ("great_scott", "greatScott", "Great-Scott")
+    assert normalize_cache_info().misses == 1
+    assert not hasattr(casings, "__dict__")
+    assert repr(casings) == "Casings('Great Scott')"
+
+
+def test_slug_registry() -> None:
+    """Should issue unique slugs with a numeric suffix for collisions."""
+    registry = SlugRegistry()
+    assert [registry.issue(string) for string in ["Great Scott", "great scott!!", "Great_Scott", "McFly"]] == [
+        "great-scott",
+        "great-scott-2",
+        "great-scott-3",
+        "mcfly",
+    ]
+    assert "great-scott-2" in registry
+    assert len(registry) == 4
+
+
+def test_slug_registry_existing() -> None:
+    """Should never issue a slug that was taken before."""
+    registry = SlugRegistry(["great-scott", "great-scott-3"])
+    assert [registry.issue("Great Scott") for _ in range(3)] == ["great-scott-2", "great-scott-4", "great-scott-5"]
+
+
+def test_slug_registry_max_length() -> None:
+    """Should cut the base slug to make room for the suffix."""
+    registry = SlugRegistry(max_length=8)
+    slugs = [registry.issue("Great Scott") for _ in range(11)]
+    assert slugs[:3] == ["great-sc", "great-2", "great-3"]
+    assert slugs[-1] == "great-11"
+    assert all(len(slug) <= 8 for slug in slugs)
+    assert len(set(slugs)) == len(slugs)
+
+
+def test_slug_registry_thread_safe() -> None:
+    """Should issue unique slugs when used from multiple threads."""
+    registry = SlugRegistry()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        slugs = list(executor.map(registry.issue, ["Great Scott"] * 1000))
+    assert len(set(slugs)) == 1000
+
+
+def test_slug_registry_invalid_max_length() -> None:
+    """Should raise a ValueError for an invalid max length."""
+    with pytest.raises(ValueError, match="Max length must be > 0, invalid value 0"):
+        SlugRegistry(max_length=0)
+
+
+@pytest.mark.parametrize(
+    ("registry", "string", "match"),
+    [
+        (SlugRegistry(), "!! 💩", "Can't create a slug from '!! 💩'"),
+        (SlugRegistry(["gr"], max_length=2), "Great Scott", "Max length 2 is too short to make 'gr' unique"),
+    ],
+)
+def test_slug_registry_invalid(registry: SlugRegistry, string: str, match: str) -> None:
+    """Should raise a ValueError when no valid slug can be issued."""
+    with pytest.raises(ValueError, match=match):
+        registry.issue(string)
+
+
+@pytest.mark.parametrize(
+    ("string", "max_bytes", "suffix", "encoding", "expected"),
+    [
+        ("hello world", 11, "...", "utf-8", "hello world"),
+        ("hello world", 8, "...", "utf-8", "hello..."),
+        ("hello world", 3, "...", "utf-8", "..."),
+        ("hello world", 5, "", "utf-8", "hello"),
+        ("", 1, "...", "utf-8", ""),
+        ("gréat scött", 13, "", "utf-8", "gréat scött"),
+        ("gréat scött", 12, "", "utf-8", "gréat scöt"),
+        ("gréat scött", 11, "", "utf-8", "gréat scö"),
+        ("gréat scött", 10, "", "utf-8", "gréat sc"),
+        ("gréat", 3, "", "utf-8", "gr"),
+        ("gréat", 4, "", "utf-8", "gré"),
+        ("世界世界", 8, "…", "utf-8", "世…"),
+        ("💩💩", 7, "", "utf-8", "💩"),
+        ("💩💩", 3, "", "utf-8", ""),
+        ("gréat scött", 6, "~", "latin-1", "gréat~"),
+        ("gréat scött", 7, "", "utf-16-le", "gré"),
+        ("💩💩", 6, "", "utf-16-le", "💩"),
+    ],
+)
+def test_truncate_bytes(string: str, max_bytes: int, suffix: str, encoding: str, expected: str) -> None:
+    """Should truncate a string to a number of encoded bytes without splitting a character."""
+    result = truncate_bytes(string, max_bytes, suffix, encoding)
+    assert result == expected
+    assert len(result.encode(encoding)) <= max_bytes
+
+
+@pytest.mark.parametrize(
+    ("max_bytes", "suffix", "match"),
+    [
+        (0, "...", "Max bytes must be a positive integer."),
+        (-1, "...", "Max bytes must be a positive integer."),
+        (2, "...", "Suffix '...' does not fit in 2 bytes."),
+    ],
+)
+def test_truncate_bytes_invalid(max_bytes: int, suffix: str, match: str) -> None:
+    """Should raise a ValueError for an invalid number of bytes."""
+    with pytest.raises(ValueError, match=match):
+        truncate_bytes("hello world", max_bytes, suffix)
+
+
+PAYLOAD = {"user_id": 1, "full name": {"first-name": "Marty", "tags": [{"flux_capacitor": True}, "great_scott"]}, 2: {}}
+
+
+def test_transform_keys() -> None:
+    """Should convert the keys of nested dictionaries and leave the input untouched."""
+    car = object()
+    payload = {**PAYLOAD, "car_names": [car]}
+    result = transform_keys(payload, "camel_case")
+    assert result == {
+        "userId": 1,
+        "fullName": {"firstName": "Marty", "tags": [{"fluxCapacitor": True}, "great_scott"]},
+        2: {},
+        "carNames": [car],
+    }
+    assert list(payload) == ["user_id", "full name", 2, "car_names"]
+    assert result["carNames"] is not payload["car_names"]
+    assert result["carNames"][0] is car
+
+
+def test_transform_keys_in_place() -> None:
+    """Should rewrite the keys of the given dictionaries."""
+    payload = {"user_id": 1, "nested": [{"flux_capacitor": {"jigo_watts": 1.21}}]}
+    nested = payload["nested"]
+    assert transform_keys(payload, "kebab_case", in_place=True) is payload
+    assert payload == {"user-id": 1, "nested": [{"flux-capacitor": {"jigo-watts": 1.21}}]}
+    assert payload["nested"] is nested
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+def test_transform_keys_deep(in_place: bool) -> None:
+    """Should handle nesting deeper than the recursion limit."""
+    payload: dict[str, object] = {}
+    node = payload
+    for _ in range(5000):
+        node["great_scott"] = node = {}
+    result = transform_keys(payload, "pascal_case", in_place=in_place)
+    for _ in range(5000):
+        result = result["GreatScott"]
+    assert result == {}
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+def test_transform_keys_shared(in_place: bool) -> None:
+    """Should convert shared and self referencing containers once."""
+    shared = {"flux_capacitor": 1}
+    payload: dict[str, object] = {"first_car": shared, "second_car": shared}
+    payload["self_ref"] = payload
+    result = transform_keys(payload, "dot_case", in_place=in_place)
+    assert result["first.car"] is result["second.car"]
+    assert result["first.car"] == {"flux.capacitor": 1}
+    assert result["self.ref"] is result
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+def test_transform_keys_round_trip(in_place: bool) -> None:
+    """Should convert camelCase keys back to snake_case when splitting words."""
+    payload = {"user_id": 1, "full_name": {"first_name": "Marty", "tags": [{"flux_capacitor": True}]}}
+    camel = transform_keys(payload, "camel_case")
+    assert transform_keys(camel, "snake_case") == {
+        "userid": 1,
+        "fullname": {"firstname": "Marty", "tags": [{"fluxcapacitor": True}]},
+    }
+    assert transform_keys(camel, "snake_case", in_place=in_place, split_words=True) == payload
+
+
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        ("userId", "user_id"),
+        ("UserID", "user_id"),
+        ("HTTPStatus", "http_status"),
+        ("user2Id", "user2_id"),
+        ("user_id", "user_id"),
+    ],
+)
+def test_transform_keys_split_words(key: str, expected: str) -> None:
+    """Should separate words at camelCase and PascalCase boundaries."""
+    assert transform_keys({key: 1}, "snake_case", split_words=True) == {expected: 1}
+
+
+@pytest.mark.parametrize("obj", ["great_scott", 1, None])
+def test_transform_keys_scalar(obj: object) -> None:
+    """Should return anything that is not a dictionary or list as-is."""
+    assert transform_keys(obj, "camel_case") is obj
+
+
+def test_transform_keys_invalid_style() -> None:
+    """Should raise a ValueError for an unknown style."""
+    with pytest.raises(ValueError, match="Style must be one of"):
+        transform_keys({}, "sarcasm_case")